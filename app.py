@@ -1,303 +1,444 @@
-from http.server import BaseHTTPRequestHandler
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import json
+import functools
+import gzip
 import os
-import asyncio
-import aiohttp
-from datetime import datetime
-from urllib.parse import urlparse, parse_qs
-import io
-import base64
+import random
+import time
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# msgspec is the lighter-weight fast encoder for deployments that can't ship orjson
+try:
+    import msgspec
+    _msgspec_encoder = msgspec.json.Encoder()
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+
+def _dumps(data):
+    """Serialize a response payload to compact JSON bytes with the fastest available encoder"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    if MSGSPEC_AVAILABLE:
+        return _msgspec_encoder.encode(data)
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+def _loads(body):
+    """Parse a JSON request body straight from bytes; raises ValueError on malformed input"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(body)
+    if MSGSPEC_AVAILABLE:
+        try:
+            return msgspec.json.decode(body)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+    return json.loads(body)
+
+
+# Placeholder stamped into prebuilt bodies and swapped for the current time per request
+_TS_PLACEHOLDER = b"__TS__"
+
+
+# (epoch second, formatted bytes) of the last timestamp handed out
+_cached_ts = (0, b"")
+
+
+def _now_iso_bytes():
+    """Current UTC time as ISO-8601 bytes with a trailing Z, formatted at most once per second"""
+    global _cached_ts
+    now = int(time.time())
+    if now != _cached_ts[0]:
+        _cached_ts = (now, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)).encode())
+    return _cached_ts[1]
+
+
+# Constant response bodies, serialized once at import
+_ROOT_BODY = _dumps({
+    "name": "NASA Space Weather Forecaster",
+    "version": "2.0.0",
+    "status": "online",
+    "description": "Real-time space weather forecasting using NASA data and AI analysis",
+    "endpoints": {
+        "health": "/api/health",
+        "forecast": "/api/forecast",
+        "status": "/api/status",
+        "dashboard": "/live_dashboard.html"
+    }
+})
+
+_HEALTH_TEMPLATE = _dumps({
+    "success": True,
+    "data": {
+        "status": "healthy",
+        "service": "nasa-space-weather-api",
+        "environment": "vercel-python",
+        "timestamp": _TS_PLACEHOLDER.decode()
+    }
+})
+
+# Environment configuration is fixed for the lifetime of the process
+_NASA_CONFIGURED = bool(os.getenv("NASA_API_KEY"))
+_ANTHROPIC_CONFIGURED = bool(os.getenv("ANTHROPIC_API_KEY"))
+_OPENAI_CONFIGURED = bool(os.getenv("OPENAI_API_KEY"))
+_HUGGINGFACE_CONFIGURED = bool(os.getenv("HUGGINGFACE_API_KEY"))
+_EMAIL_CONFIGURED = bool(os.getenv("EMAIL_USER")) and bool(os.getenv("EMAIL_PASSWORD"))
+_TWILIO_CONFIGURED = bool(os.getenv("TWILIO_ACCOUNT_SID"))
+
+# TTS provider keys used by the POST endpoints
+_ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
+_OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+# Keep-alive session shared by the TTS calls, created on first use so
+# workers that only serve GET requests never import requests
+_http_session = None
+
+
+def _get_http_session():
+    """Pooled HTTP session reused across upstream TTS requests"""
+    global _http_session
+    if _http_session is None:
+        import requests
+        _http_session = requests.Session()
+    return _http_session
+
+
+_STATUS_TEMPLATE = _dumps({
+    "success": True,
+    "data": {
+        "api": "online",
+        "deployment": "vercel-python",
+        "version": "2.0.0",
+        "services": {
+            "nasa_api": "configured" if _NASA_CONFIGURED else "not_configured",
+            "anthropic_ai": "configured" if _ANTHROPIC_CONFIGURED else "not_configured",
+            "openai": "configured" if _OPENAI_CONFIGURED else "not_configured",
+            "huggingface": "configured" if _HUGGINGFACE_CONFIGURED else "not_configured",
+            "email_alerts": "configured" if _EMAIL_CONFIGURED else "not_configured",
+            "sms_alerts": "configured" if _TWILIO_CONFIGURED else "not_configured"
+        },
+        "capabilities": {
+            "forecasting": _NASA_CONFIGURED and (_ANTHROPIC_CONFIGURED or _OPENAI_CONFIGURED),
+            "email_notifications": _EMAIL_CONFIGURED,
+            "sms_notifications": _TWILIO_CONFIGURED,
+            "ml_models": _HUGGINGFACE_CONFIGURED
+        },
+        "timestamp": _TS_PLACEHOLDER.decode()
+    }
+})
+
+def _load_page_compressed(filename, encoding):
+    """Return an HTML page compressed with the given content coding ('br' or 'gzip')
+
+    Each page is compressed once per modification time and then served from
+    memory, so an edited file is picked up on its next request. Uncompressed
+    pages are not cached; they are sent straight from disk with sendfile.
+    Missing files raise FileNotFoundError.
+    """
+    return _compress_page(filename, os.stat(filename).st_mtime_ns, encoding)
+
+
+@functools.lru_cache(maxsize=128)
+def _compress_page(filename, mtime_ns, encoding):
+    with open(filename, 'rb') as f:
+        raw = f.read()
+    if encoding == 'br':
+        return brotli.compress(raw, quality=11)
+    return gzip.compress(raw, compresslevel=9)
+
+
+# Fixed response headers, built once and shared by every response
+_JSON_HEADERS = (
+    ('Content-type', 'application/json'),
+    ('Access-Control-Allow-Origin', '*'),
+)
+_HTML_HEADERS = (
+    ('Content-type', 'text/html; charset=utf-8'),
+    ('Access-Control-Allow-Origin', '*'),
+    ('Vary', 'Accept-Encoding'),
+)
+_HTML_GZIP_HEADERS = _HTML_HEADERS + (('Content-Encoding', 'gzip'),)
+_HTML_BR_HEADERS = _HTML_HEADERS + (('Content-Encoding', 'br'),)
+_AUDIO_HEADERS = (
+    ('Content-type', 'audio/mpeg'),
+    ('Access-Control-Allow-Origin', '*'),
+)
+_PREFLIGHT_HEADERS = (
+    ('Access-Control-Allow-Origin', '*'),
+    ('Access-Control-Allow-Methods', 'GET, POST, OPTIONS'),
+    ('Access-Control-Allow-Headers', 'Content-Type'),
+)
+
+# Static HTML pages served straight from the project root
+HTML_FILES = [
+    # Main dashboards
+    '/live_dashboard.html', '/dashboard_hub.html', '/simple_working_dashboard.html',
+    '/spectacular_dashboard.html', '/professional_dashboard.html', '/expert_dashboard.html',
+    
+    # 3D Dashboards
+    '/3d_advanced_hub.html', '/3d_dashboard.html', '/3d_solar_system.html', '/3d_test_page.html',
+    '/enhanced_3d_solar_system.html', '/working_3d_solar_system.html', '/spectacular_3d_space_weather.html',
+    '/test_3d_dashboard.html',
+    
+    # Specialized dashboards
+    '/nasa_heliophysics_observatory.html', '/space_weather_research_center.html',
+    '/simple_new.html', '/test_ensemble_dashboard.html',
+    
+    # Viral-ready features
+    '/aurora_alerts.html', '/social_share.html', '/space_weather_chatbot.html', '/iss_tracker.html',
+    '/video_content_hub.html',
+    
+    # Testing and utilities
+    '/export_test.html', '/mobile_test.html', '/websocket_test.html', '/simple.html'
+]
+
+
+# (timestamp, body) of the last /api/health response; probes within the same
+# second get the identical bytes back
+_health_cache = (b"", b"")
+
+
+def _build_health_response():
+    """Serialized /api/health body"""
+    global _health_cache
+    ts = _now_iso_bytes()
+    if ts != _health_cache[0]:
+        _health_cache = (ts, _HEALTH_TEMPLATE.replace(_TS_PLACEHOLDER, ts))
+    return _health_cache[1]
+
+
+# The demo forecast is static apart from its timestamps and the randomized
+# event summary, so it is serialized once with placeholders for both.
+# The /api/forecast body is a static demo, not a generated forecast.
+_FORECAST_LIVE = _NASA_CONFIGURED and _ANTHROPIC_CONFIGURED
+_TS_PLACEHOLDER_STR = _TS_PLACEHOLDER.decode()
+_SUMMARY_PLACEHOLDER = b'"__SUMMARY__"'
+
+_FORECAST_TEMPLATE = _dumps({
+    "success": True,
+    "data": {
+        "forecast": {
+            "forecasts": [
+                {
+                    "event": "CME",
+                    "solar_timestamp": _TS_PLACEHOLDER_STR,
+                    "predicted_arrival_window_utc": [
+                        _TS_PLACEHOLDER_STR,
+                        _TS_PLACEHOLDER_STR
+                    ],
+                    "risk_summary": "Moderate geomagnetic activity expected. Aurora possible at high latitudes.",
+                    "impacts": ["aurora_visibility", "gps_accuracy", "hf_radio_disruption"],
+                    "confidence": 0.75,
+                    "evidence": {
+                        "donki_ids": ["2024-001-CME"],
+                        "epic_frames": [_TS_PLACEHOLDER_STR],
+                        "gibs_layers": ["VIIRS_SNPP_CorrectedReflectance_TrueColor"]
+                    }
+                },
+                {
+                    "event": "FLARE",
+                    "solar_timestamp": _TS_PLACEHOLDER_STR,
+                    "predicted_arrival_window_utc": [
+                        _TS_PLACEHOLDER_STR,
+                        _TS_PLACEHOLDER_STR
+                    ],
+                    "risk_summary": "Minor X-ray flux enhancement detected. Minimal Earth impact expected.",
+                    "impacts": ["hf_radio_minor"],
+                    "confidence": 0.85,
+                    "evidence": {
+                        "donki_ids": ["2024-002-FLR"],
+                        "epic_frames": [_TS_PLACEHOLDER_STR],
+                        "gibs_layers": ["MODIS_Aqua_CorrectedReflectance_TrueColor"]
+                    }
+                }
+            ]
+        },
+        "summary": _SUMMARY_PLACEHOLDER[1:-1].decode(),
+        "generated_at": _TS_PLACEHOLDER_STR,
+        "source": "live_capable" if _FORECAST_LIVE else "demo_mode",
+        "note": ("API keys configured - real forecasting capability available" if _FORECAST_LIVE
+                 else "Demo mode - configure NASA_API_KEY and ANTHROPIC_API_KEY for live forecasting"),
+        "api_status": {
+            "nasa_configured": _NASA_CONFIGURED,
+            "ai_configured": _ANTHROPIC_CONFIGURED
+        }
+    }
+})
+
+
+def _build_forecast_response():
+    """Serialized /api/forecast body"""
+    # Return demo forecast data with realistic space weather activity
+    # random() is a single C call; randint() goes through pure-Python range checks
+    cme_count = 2 + int(random.random() * 7)     # 2..8
+    flare_count = 3 + int(random.random() * 10)  # 3..12
+    activity_level = "HIGH" if (cme_count + flare_count) > 15 else "MODERATE" if (cme_count + flare_count) > 8 else "LOW"
+
+    summary = _dumps({
+        "cme_count": cme_count,
+        "solar_flare_count": flare_count,
+        "total_events": cme_count + flare_count,
+        "activity_level": activity_level
+    })
+    return (_FORECAST_TEMPLATE
+            .replace(_TS_PLACEHOLDER, _now_iso_bytes())
+            .replace(_SUMMARY_PLACEHOLDER, summary))
+
+
+def _build_status_response():
+    """Serialized /api/status body"""
+    return _STATUS_TEMPLATE.replace(_TS_PLACEHOLDER, _now_iso_bytes())
+
+
+# Quoted JSON string swapped for the requested path in the 404 template
+_PATH_PLACEHOLDER = b'"__PATH__"'
+
+_NOT_FOUND_TEMPLATE = _dumps({
+    "success": False,
+    "error": "Endpoint not found",
+    "path": _PATH_PLACEHOLDER[1:-1].decode(),
+    "available_endpoints": {
+        "api_endpoints": ["/api/health", "/api/forecast", "/api/status"],
+        "main_dashboards": ["/", "/dashboard_hub.html", "/live_dashboard.html", "/spectacular_dashboard.html"],
+        "viral_features": ["/aurora_alerts.html", "/social_share.html", "/space_weather_chatbot.html", "/iss_tracker.html"],
+        "3d_dashboards": ["/3d_advanced_hub.html", "/3d_solar_system.html", "/enhanced_3d_solar_system.html"],
+        "all_html_files": HTML_FILES
+    }
+})
+
+
+def _build_not_found_response(path):
+    """Serialized 404 body listing the available endpoints"""
+    # The path is client-controlled, so it is JSON-encoded rather than spliced in raw
+    return _NOT_FOUND_TEMPLATE.replace(_PATH_PLACEHOLDER, _dumps(path))
+
 
 class handler(BaseHTTPRequestHandler):
+    # Buffer the socket writer so the header block and a typical body leave
+    # in one send() at the explicit flush, instead of one per write
+    wbufsize = 64 * 1024
+    
     def do_GET(self):
-        # Parse the URL
-        parsed_path = urlparse(self.path)
-        path = parsed_path.path
-        query = parse_qs(parsed_path.query)
+        # Only the path is routed on; the query string is never read
+        path = self.path.partition('?')[0]
         
-        # Don't set response headers yet - we'll do it per route
+        # Don't set response headers yet - each route sets its own
         
         try:
-            # Route handling - Serve HTML files
-            html_files = [
-                # Main dashboards
-                '/live_dashboard.html', '/dashboard_hub.html', '/simple_working_dashboard.html',
-                '/spectacular_dashboard.html', '/professional_dashboard.html', '/expert_dashboard.html',
-                
-                # 3D Dashboards
-                '/3d_advanced_hub.html', '/3d_dashboard.html', '/3d_solar_system.html', '/3d_test_page.html',
-                '/enhanced_3d_solar_system.html', '/working_3d_solar_system.html', '/spectacular_3d_space_weather.html',
-                '/test_3d_dashboard.html',
-                
-                # Specialized dashboards
-                '/nasa_heliophysics_observatory.html', '/space_weather_research_center.html',
-                '/simple_new.html', '/test_ensemble_dashboard.html',
-                
-                # Viral-ready features
-                '/aurora_alerts.html', '/social_share.html', '/space_weather_chatbot.html', '/iss_tracker.html',
-                '/video_content_hub.html',
-                
-                # Testing and utilities
-                '/export_test.html', '/mobile_test.html', '/websocket_test.html', '/simple.html'
-            ]
-            
-            if path in html_files:
-                # Serve HTML files
-                filename = path[1:]  # Remove leading slash
-                try:
-                    with open(filename, 'r', encoding='utf-8') as f:
-                        html_content = f.read()
-                    self.send_response(200)
-                    self.send_header('Content-type', 'text/html; charset=utf-8')
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.end_headers()
-                    self.wfile.write(html_content.encode('utf-8'))
-                    return
-                except FileNotFoundError:
-                    self.send_response(404)
-                    self.send_header('Content-type', 'application/json')
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.end_headers()
-                    error_response = {
-                        "success": False,
-                        "error": f"File {filename} not found",
-                        "path": path
-                    }
-                    self.wfile.write(json.dumps(error_response).encode())
-                    return
-            
-            elif path == '/' or path == '':
-                # Serve the spectacular dashboard as the main page
-                try:
-                    with open('dashboard_hub.html', 'r', encoding='utf-8') as f:
-                        html_content = f.read()
-                    self.send_response(200)
-                    self.send_header('Content-type', 'text/html; charset=utf-8')
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.end_headers()
-                    self.wfile.write(html_content.encode('utf-8'))
-                    return
-                except FileNotFoundError:
-                    # Fallback to API info if dashboard not found
-                    self.send_response(200)
-                    self.send_header('Content-type', 'application/json')
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.end_headers()
-                    response_data = {
-                        "name": "NASA Space Weather Forecaster",
-                        "version": "2.0.0", 
-                        "status": "online",
-                        "description": "Real-time space weather forecasting using NASA data and AI analysis",
-                        "endpoints": {
-                            "health": "/api/health",
-                            "forecast": "/api/forecast",
-                            "status": "/api/status",
-                            "dashboard": "/live_dashboard.html"
-                        }
-                    }
-                    self.wfile.write(json.dumps(response_data, indent=2).encode())
-                    return
-            
-            elif path == '/api/health':
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                
-                response_data = {
-                    "success": True,
-                    "data": {
-                        "status": "healthy",
-                        "service": "nasa-space-weather-api",
-                        "environment": "vercel-python",
-                        "timestamp": datetime.utcnow().isoformat() + "Z"
-                    }
-                }
-                self.wfile.write(json.dumps(response_data, indent=2).encode())
-                return
-            
-            elif path == '/api/forecast':
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                
-                # Check if we have real API keys to potentially make real calls
-                nasa_key = os.getenv("NASA_API_KEY")
-                anthropic_key = os.getenv("ANTHROPIC_API_KEY")
-                
-                if nasa_key and anthropic_key:
-                    # TODO: Implement real forecast generation when dependencies are available
-                    source = "live_capable"
-                    note = "API keys configured - real forecasting capability available"
-                else:
-                    source = "demo_mode"
-                    note = "Demo mode - configure NASA_API_KEY and ANTHROPIC_API_KEY for live forecasting"
-                
-                # Return demo forecast data with realistic space weather activity
-                import random
-                cme_count = random.randint(2, 8)
-                flare_count = random.randint(3, 12)
-                activity_level = "HIGH" if (cme_count + flare_count) > 15 else "MODERATE" if (cme_count + flare_count) > 8 else "LOW"
-                
-                response_data = {
-                    "success": True,
-                    "data": {
-                        "forecast": {
-                            "forecasts": [
-                                {
-                                    "event": "CME",
-                                    "solar_timestamp": datetime.utcnow().isoformat() + "Z",
-                                    "predicted_arrival_window_utc": [
-                                        (datetime.utcnow()).isoformat() + "Z",
-                                        (datetime.utcnow()).isoformat() + "Z"
-                                    ],
-                                    "risk_summary": "Moderate geomagnetic activity expected. Aurora possible at high latitudes.",
-                                    "impacts": ["aurora_visibility", "gps_accuracy", "hf_radio_disruption"],
-                                    "confidence": 0.75,
-                                    "evidence": {
-                                        "donki_ids": ["2024-001-CME"],
-                                        "epic_frames": [datetime.utcnow().isoformat() + "Z"],
-                                        "gibs_layers": ["VIIRS_SNPP_CorrectedReflectance_TrueColor"]
-                                    }
-                                },
-                                {
-                                    "event": "FLARE",
-                                    "solar_timestamp": (datetime.utcnow()).isoformat() + "Z",
-                                    "predicted_arrival_window_utc": [
-                                        datetime.utcnow().isoformat() + "Z",
-                                        datetime.utcnow().isoformat() + "Z"
-                                    ],
-                                    "risk_summary": "Minor X-ray flux enhancement detected. Minimal Earth impact expected.",
-                                    "impacts": ["hf_radio_minor"],
-                                    "confidence": 0.85,
-                                    "evidence": {
-                                        "donki_ids": ["2024-002-FLR"],
-                                        "epic_frames": [datetime.utcnow().isoformat() + "Z"],
-                                        "gibs_layers": ["MODIS_Aqua_CorrectedReflectance_TrueColor"]
-                                    }
-                                }
-                            ]
-                        },
-                        "summary": {
-                            "cme_count": cme_count,
-                            "solar_flare_count": flare_count,
-                            "total_events": cme_count + flare_count,
-                            "activity_level": activity_level
-                        },
-                        "generated_at": datetime.utcnow().isoformat() + "Z",
-                        "source": source,
-                        "note": note,
-                        "api_status": {
-                            "nasa_configured": bool(nasa_key),
-                            "ai_configured": bool(anthropic_key)
-                        }
-                    }
-                }
-                self.wfile.write(json.dumps(response_data, indent=2).encode())
-                return
-            
-            elif path == '/api/status':
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                
-                # Check all environment variables
-                nasa_key = bool(os.getenv("NASA_API_KEY"))
-                anthropic_key = bool(os.getenv("ANTHROPIC_API_KEY"))
-                openai_key = bool(os.getenv("OPENAI_API_KEY"))
-                huggingface_key = bool(os.getenv("HUGGINGFACE_API_KEY"))
-                email_user = bool(os.getenv("EMAIL_USER"))
-                email_password = bool(os.getenv("EMAIL_PASSWORD"))
-                twilio_sid = bool(os.getenv("TWILIO_ACCOUNT_SID"))
-                
-                response_data = {
-                    "success": True,
-                    "data": {
-                        "api": "online",
-                        "deployment": "vercel-python",
-                        "version": "2.0.0",
-                        "services": {
-                            "nasa_api": "configured" if nasa_key else "not_configured",
-                            "anthropic_ai": "configured" if anthropic_key else "not_configured", 
-                            "openai": "configured" if openai_key else "not_configured",
-                            "huggingface": "configured" if huggingface_key else "not_configured",
-                            "email_alerts": "configured" if (email_user and email_password) else "not_configured",
-                            "sms_alerts": "configured" if twilio_sid else "not_configured"
-                        },
-                        "capabilities": {
-                            "forecasting": nasa_key and (anthropic_key or openai_key),
-                            "email_notifications": email_user and email_password,
-                            "sms_notifications": twilio_sid,
-                            "ml_models": huggingface_key
-                        },
-                        "timestamp": datetime.utcnow().isoformat() + "Z"
-                    }
-                }
-                self.wfile.write(json.dumps(response_data, indent=2).encode())
-                return
-            
+            route = _ROUTES.get(path)
+            if route is None:
+                self._serve_not_found(path)
             else:
-                # 404 for unknown paths
-                self.send_response(404)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                response_data = {
-                    "success": False,
-                    "error": "Endpoint not found",
-                    "path": path,
-                    "available_endpoints": {
-                        "api_endpoints": ["/api/health", "/api/forecast", "/api/status"],
-                        "main_dashboards": ["/", "/dashboard_hub.html", "/live_dashboard.html", "/spectacular_dashboard.html"],
-                        "viral_features": ["/aurora_alerts.html", "/social_share.html", "/space_weather_chatbot.html", "/iss_tracker.html"],
-                        "3d_dashboards": ["/3d_advanced_hub.html", "/3d_solar_system.html", "/enhanced_3d_solar_system.html"],
-                        "all_html_files": html_files
-                    }
-                }
-                self.wfile.write(json.dumps(response_data, indent=2).encode())
-                return
+                route(self, path)
         
         except Exception as e:
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
             error_response = {
                 "success": False,
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat() + "Z"
+                "timestamp": _now_iso_bytes().decode()
+            }
+            self._send_json(500, _dumps(error_response))
+    
+    def _serve_html(self, path):
+        # Serve HTML files
+        filename = path[1:]  # Remove leading slash
+        try:
+            self._send_page(filename)
+        except FileNotFoundError:
+            error_response = {
+                "success": False,
+                "error": f"File {filename} not found",
+                "path": path
             }
-            self.wfile.write(json.dumps(error_response).encode())
+            self._send_json(404, _dumps(error_response))
+    
+    def _serve_root(self, path):
+        # Serve the dashboard hub as the main page
+        try:
+            self._send_page('dashboard_hub.html')
+        except FileNotFoundError:
+            # Fallback to API info if dashboard not found
+            self._send_json(200, _ROOT_BODY)
+    
+    def _send_page(self, filename):
+        # Serve an HTML page compressed from memory when the client accepts it,
+        # preferring Brotli over gzip
+        accept_encoding = self.headers.get('Accept-Encoding', '')
+        if BROTLI_AVAILABLE and 'br' in accept_encoding:
+            self._respond(200, _load_page_compressed(filename, 'br'), _HTML_BR_HEADERS)
+        elif 'gzip' in accept_encoding:
+            self._respond(200, _load_page_compressed(filename, 'gzip'), _HTML_GZIP_HEADERS)
+        else:
+            self._send_file(filename, _HTML_HEADERS)
+    
+    def _send_file(self, filename, headers):
+        # Zero-copy: the kernel moves the file from page cache to the socket.
+        # socket.sendfile falls back to plain send() where sendfile(2) is missing.
+        with open(filename, 'rb') as f:
+            self.send_response(200)
+            for name, value in headers:
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(os.fstat(f.fileno()).st_size))
+            self.end_headers()
+            self.wfile.flush()
+            self.connection.sendfile(f)
+    
+    def _send_json(self, status, body):
+        self._respond(status, body, _JSON_HEADERS)
+    
+    def _respond(self, status, body, headers):
+        # Single exit point for buffered responses; the body is fully built
+        # before the headers go out so Content-Length is always known
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.wfile.flush()
+    
+    def _serve_health(self, path):
+        self._send_json(200, _build_health_response())
+    
+    def _serve_forecast(self, path):
+        self._send_json(200, _build_forecast_response())
+    
+    def _serve_status(self, path):
+        self._send_json(200, _build_status_response())
+    
+    def _serve_not_found(self, path):
+        # 404 for unknown paths
+        self._send_json(404, _build_not_found_response(path))
     
     def do_POST(self):
         # Handle POST requests (mainly for TTS APIs)
-        parsed_path = urlparse(self.path)
-        path = parsed_path.path
+        path = self.path.partition('?')[0]
         
         try:
             if path == '/api/speak':
                 # Handle ElevenLabs TTS requests
-                content_length = int(self.headers['Content-Length'])
-                post_data = self.rfile.read(content_length)
-                request_data = json.loads(post_data.decode('utf-8'))
-                
-                # Get ElevenLabs API key
-                elevenlabs_key = os.getenv("ELEVENLABS_API_KEY")
+                request_data = self._read_json_body()
+                if request_data is None:
+                    return
                 
-                if not elevenlabs_key:
-                    self.send_response(400)
-                    self.send_header('Content-type', 'application/json')
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"error": "ElevenLabs API key not configured"}).encode())
+                if not _ELEVENLABS_API_KEY:
+                    self._send_json(400, _dumps({"error": "ElevenLabs API key not configured"}))
                     return
                 
                 try:
                     # Call ElevenLabs API
-                    import requests
-                    
                     voice_id = request_data.get('voice_id', 'TxGEqnHWrfWFTfGW9XjX')
                     text = request_data.get('text', '')
                     
@@ -305,7 +446,7 @@ class handler(BaseHTTPRequestHandler):
                     headers = {
                         "Accept": "audio/mpeg",
                         "Content-Type": "application/json",
-                        "xi-api-key": elevenlabs_key
+                        "xi-api-key": _ELEVENLABS_API_KEY
                     }
                     data = {
                         "text": text,
@@ -316,56 +457,35 @@ class handler(BaseHTTPRequestHandler):
                         }
                     }
                     
-                    response = requests.post(url, json=data, headers=headers)
-                    
-                    if response.status_code == 200:
-                        self.send_response(200)
-                        self.send_header('Content-type', 'audio/mpeg')
-                        self.send_header('Access-Control-Allow-Origin', '*')
-                        self.end_headers()
-                        self.wfile.write(response.content)
-                    else:
-                        self.send_response(response.status_code)
-                        self.send_header('Content-type', 'application/json')
-                        self.send_header('Access-Control-Allow-Origin', '*')
-                        self.end_headers()
-                        self.wfile.write(json.dumps({"error": "ElevenLabs API error"}).encode())
+                    with _get_http_session().post(url, data=_dumps(data), headers=headers,
+                                                  timeout=30, stream=True) as response:
+                        if response.status_code == 200:
+                            self._stream_audio(response)
+                        else:
+                            self._send_json(response.status_code, _dumps({"error": "ElevenLabs API error"}))
                         
                 except Exception as e:
-                    self.send_response(500)
-                    self.send_header('Content-type', 'application/json')
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"error": str(e)}).encode())
+                    self._send_json(500, _dumps({"error": str(e)}))
                 return
             
             elif path == '/api/openai-speak':
                 # Handle OpenAI TTS requests
-                content_length = int(self.headers['Content-Length'])
-                post_data = self.rfile.read(content_length)
-                request_data = json.loads(post_data.decode('utf-8'))
-                
-                # Get OpenAI API key
-                openai_key = os.getenv("OPENAI_API_KEY")
+                request_data = self._read_json_body()
+                if request_data is None:
+                    return
                 
-                if not openai_key:
-                    self.send_response(400)
-                    self.send_header('Content-type', 'application/json')
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"error": "OpenAI API key not configured"}).encode())
+                if not _OPENAI_API_KEY:
+                    self._send_json(400, _dumps({"error": "OpenAI API key not configured"}))
                     return
                 
                 try:
                     # Call OpenAI TTS API
-                    import requests
-                    
                     voice = request_data.get('voice', 'alloy')
                     text = request_data.get('text', '')
                     
                     url = "https://api.openai.com/v1/audio/speech"
                     headers = {
-                        "Authorization": f"Bearer {openai_key}",
+                        "Authorization": f"Bearer {_OPENAI_API_KEY}",
                         "Content-Type": "application/json"
                     }
                     data = {
@@ -375,40 +495,79 @@ class handler(BaseHTTPRequestHandler):
                         "response_format": "mp3"
                     }
                     
-                    response = requests.post(url, json=data, headers=headers)
-                    
-                    if response.status_code == 200:
-                        self.send_response(200)
-                        self.send_header('Content-type', 'audio/mpeg')
-                        self.send_header('Access-Control-Allow-Origin', '*')
-                        self.end_headers()
-                        self.wfile.write(response.content)
-                    else:
-                        self.send_response(response.status_code)
-                        self.send_header('Content-type', 'application/json')
-                        self.send_header('Access-Control-Allow-Origin', '*')
-                        self.end_headers()
-                        self.wfile.write(json.dumps({"error": "OpenAI TTS API error"}).encode())
+                    with _get_http_session().post(url, data=_dumps(data), headers=headers,
+                                                  timeout=30, stream=True) as response:
+                        if response.status_code == 200:
+                            self._stream_audio(response)
+                        else:
+                            self._send_json(response.status_code, _dumps({"error": "OpenAI TTS API error"}))
                         
                 except Exception as e:
-                    self.send_response(500)
-                    self.send_header('Content-type', 'application/json')
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"error": str(e)}).encode())
+                    self._send_json(500, _dumps({"error": str(e)}))
                 return
+            
+            else:
+                self._serve_not_found(path)
                 
         except Exception as e:
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps({"error": str(e)}).encode())
+            self._send_json(500, _dumps({"error": str(e)}))
+
+    def _stream_audio(self, response):
+        # Relay upstream audio as it arrives instead of buffering the whole clip
+        self.send_response(200)
+        for name, value in _AUDIO_HEADERS:
+            self.send_header(name, value)
+        # iter_content decodes any transfer compression, so only an
+        # uncompressed upstream length matches what we forward
+        upstream_length = response.headers.get('Content-Length')
+        if upstream_length and 'Content-Encoding' not in response.headers:
+            self.send_header('Content-Length', upstream_length)
+        self.end_headers()
+        try:
+            for chunk in response.iter_content(chunk_size=16384):
+                self.wfile.write(chunk)
+                self.wfile.flush()
+        except OSError:
+            # Headers are already out, so the only option is to drop the connection
+            self.close_connection = True
+
+    def _read_json_body(self):
+        # Parse the POST body, answering 400 ourselves when it isn't a JSON object
+        content_length = int(self.headers['Content-Length'])
+        try:
+            data = _loads(self.rfile.read(content_length))
+        except ValueError:
+            self._send_json(400, _dumps({"error": "Request body must be valid JSON"}))
+            return None
+        if not isinstance(data, dict):
+            self._send_json(400, _dumps({"error": "Request body must be a JSON object"}))
+            return None
+        return data
 
     def do_OPTIONS(self):
         # Handle CORS preflight requests
-        self.send_response(200)
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.end_headers()
\ No newline at end of file
+        self._respond(200, b'', _PREFLIGHT_HEADERS)
+
+
+# Path -> route method dispatch table for do_GET
+_ROUTES = {
+    '/': handler._serve_root,
+    '': handler._serve_root,
+    '/api/health': handler._serve_health,
+    '/api/forecast': handler._serve_forecast,
+    '/api/status': handler._serve_status,
+}
+_ROUTES.update(dict.fromkeys(HTML_FILES, handler._serve_html))
+
+
+if __name__ == "__main__":
+    # Local server; one thread per connection so slow TTS upstream calls
+    # don't block dashboard and API requests
+    port = int(os.getenv("PORT", "8000"))
+    server = ThreadingHTTPServer(('0.0.0.0', port), handler)
+    print(f"Serving NASA Space Weather app on http://localhost:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down server...")
+        server.shutdown()
@@ -5,23 +5,54 @@ Advanced multimodal AI analysis with Claude integration
 """
 
 import os
-import json
-import requests
 import asyncio
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, AsyncIterator
 from dataclasses import dataclass
-from anthropic import Anthropic
-import numpy as np
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from functools import cached_property
+import aiohttp
+import orjson
+import yarl
+from fastapi import FastAPI, HTTPException, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+# anthropic, numpy and numba are imported on first use to keep cold starts fast
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan manager"""
+    # Startup: load NumPy (and compile the Numba kernel) before the first request needs it
+    _get_cme_reduce()
+    
+    yield
+    
+    # Shutdown
+    await nasa_collector.close()
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+
 
 # Initialize services
 app = FastAPI(
     title="NASA Space Weather AI Forecaster",
     description="Enterprise-grade AI-powered space weather analysis and prediction system",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -35,7 +66,93 @@ app.add_middleware(
 # Configuration
 NASA_API_KEY = os.getenv("NASA_API_KEY", "DEMO_KEY")
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
-anthropic_client = Anthropic(api_key=ANTHROPIC_API_KEY) if ANTHROPIC_API_KEY else None
+# DONKI is updated every few minutes, so repeat queries within this window reuse the last answer
+DONKI_CACHE_TTL = 600
+DONKI_CACHE_MAXSIZE = 64
+# Cap on simultaneous DONKI requests, to stay clear of NASA's per-key rate limits
+DONKI_MAX_CONCURRENCY = 6
+# Transient DONKI failures (timeouts, 429, 5xx) are retried with jittered exponential backoff
+DONKI_RETRY_ATTEMPTS = 3
+DONKI_RETRY_MAX_DELAY = 4.0
+# Claude forecasts requested at once by a backfill
+BACKFILL_AI_CONCURRENCY = 4
+
+# CME speed thresholds (km/s) separating the severity levels below
+_CME_SPEED_BOUNDS = (500.0, 1000.0, 2000.0)
+_CME_SEVERITY_LEVELS = ('low', 'moderate', 'high', 'extreme')
+
+# Set by _get_cme_reduce on first use
+np = None
+_cme_reduce = None
+
+
+def _cme_reduce_numpy(speeds: "np.ndarray", latitudes: "np.ndarray") -> Tuple["np.ndarray", int, float, float]:
+    """Severity counts, Earth-directed count, mean and max speed using NumPy reductions"""
+    counts = np.bincount(np.digitize(speeds, _CME_SPEED_BOUNDS, right=True), minlength=4)
+    earth_directed = int((np.abs(latitudes) < 30).sum())
+    if not speeds.size:
+        return counts, earth_directed, 0.0, 0.0
+    return counts, earth_directed, float(speeds.mean()), float(speeds.max())
+
+
+def _cme_reduce_loop(speeds, latitudes):
+    """Single-pass version of _cme_reduce_numpy, compiled with Numba when available"""
+    counts = np.zeros(4, dtype=np.int64)
+    total = 0.0
+    fastest = 0.0
+    for i in range(speeds.size):
+        speed = speeds[i]
+        if speed > 2000.0:
+            counts[3] += 1
+        elif speed > 1000.0:
+            counts[2] += 1
+        elif speed > 500.0:
+            counts[1] += 1
+        else:
+            counts[0] += 1
+        total += speed
+        if i == 0 or speed > fastest:
+            fastest = speed
+    
+    earth_directed = 0
+    for i in range(latitudes.size):
+        if abs(latitudes[i]) < 30.0:
+            earth_directed += 1
+    
+    mean = total / speeds.size if speeds.size else 0.0
+    return counts, earth_directed, mean, fastest
+
+
+def _get_cme_reduce():
+    """Import NumPy (and Numba, if installed) on first use and pick the CME reduction kernel"""
+    global np, _cme_reduce
+    if _cme_reduce is None:
+        import numpy as np
+        try:
+            from numba import njit
+        except ImportError:
+            _cme_reduce = _cme_reduce_numpy
+        else:
+            kernel = njit(cache=True, fastmath=True)(_cme_reduce_loop)
+            # Compile now rather than inside a request
+            kernel(np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64))
+            _cme_reduce = kernel
+    return _cme_reduce
+
+
+async def _coalesce(inflight: Dict[Any, asyncio.Future], key: Any, factory) -> Any:
+    """Run factory() once for concurrent callers sharing a key; all await the same result"""
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        inflight[key] = task
+        task.add_done_callback(lambda _: inflight.pop(key, None) if inflight.get(key) is task else None)
+    # Shield so one caller disconnecting does not cancel the work the others are waiting on
+    return await asyncio.shield(task)
+
+def _has_event_errors(data: Dict[str, Any]) -> bool:
+    """True if any event section of a collection recorded an 'error' key"""
+    return any(isinstance(event, dict) and 'error' in event for event in data['events'].values())
 
 @dataclass
 class SpaceWeatherEvent:
@@ -77,6 +194,43 @@ class AdvancedForecast(BaseModel):
     ai_model: str
     methodology: str
 
+class DonkiFetchError(Exception):
+    """A DONKI request failed (as opposed to returning no events)"""
+
+
+class CircuitBreaker:
+    """Fail fast after repeated failures; let a single trial call through once reset_timeout has passed"""
+    
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 60):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+    
+    def allow(self) -> bool:
+        if self.failures < self.fail_max:
+            return True
+        # Half-open: admit one trial caller, everyone else keeps failing fast until it resolves
+        if self.trial_in_flight or time.monotonic() - self.opened_at < self.reset_timeout:
+            return False
+        self.trial_in_flight = True
+        return True
+    
+    def record_success(self):
+        self.failures = 0
+        self.trial_in_flight = False
+    
+    def record_failure(self):
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.failures >= self.fail_max:
+            self.opened_at = time.monotonic()
+    
+    def release(self):
+        """End a trial that finished without a verdict (cancelled, or a non-retryable HTTP error)"""
+        self.trial_in_flight = False
+
 class NASADataCollector:
     """Advanced NASA API data collection and analysis"""
     
@@ -91,9 +245,70 @@ class NASADataCollector:
             'epic': 'https://api.nasa.gov/EPIC/api/natural',
             'neo': 'https://api.nasa.gov/neo/rest/v1/feed'
         }
+        # Parsed once with the API key already encoded; only the dates vary per request
+        self._urls = {
+            name: yarl.URL(url).with_query(api_key=NASA_API_KEY) for name, url in self.base_urls.items()
+        }
+        self._client_session: Optional[aiohttp.ClientSession] = None
+        self._cache: Dict[Tuple, Tuple[float, Any]] = {}
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._semaphore = asyncio.Semaphore(DONKI_MAX_CONCURRENCY)
+        self._breakers = {endpoint: CircuitBreaker() for endpoint in self.base_urls}
+    
+    async def _session(self) -> aiohttp.ClientSession:
+        """Shared HTTP session, created on first use inside the running event loop"""
+        if self._client_session is None or self._client_session.closed:
+            self._client_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=15)
+            )
+        return self._client_session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._client_session is not None:
+            await self._client_session.close()
+            self._client_session = None
+    
+    async def _cached(self, key: Tuple, fetch) -> Any:
+        """Return a fresh cached value for key, or await fetch() once to fill it.
+        
+        Concurrent misses on the same key share a single fetch. fetch returns
+        (value, cacheable); uncacheable values (failed fetches) are handed to
+        the waiting callers without being stored.
+        """
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        
+        async def fill():
+            value, cacheable = await fetch()
+            if cacheable:
+                if len(self._cache) >= DONKI_CACHE_MAXSIZE:
+                    self._evict_expired()
+                self._cache[key] = (time.monotonic() + DONKI_CACHE_TTL, value)
+            return value
+        
+        return await _coalesce(self._inflight, key, fill)
+    
+    def _evict_expired(self):
+        """Drop expired cache entries, then the oldest ones if still over capacity"""
+        now = time.monotonic()
+        for key in [k for k, (expires, _) in self._cache.items() if expires <= now]:
+            del self._cache[key]
+        while len(self._cache) >= DONKI_CACHE_MAXSIZE:
+            del self._cache[next(iter(self._cache))]
     
     async def collect_comprehensive_data(self, days_back: int = 7) -> Dict[str, Any]:
         """Collect comprehensive space weather data from multiple NASA endpoints"""
+        async def fetch():
+            data = await self._collect_comprehensive_data(days_back)
+            return data, not _has_event_errors(data)
+        
+        return await self._cached(('comprehensive', days_back), fetch)
+    
+    async def _collect_comprehensive_data(self, days_back: int) -> Dict[str, Any]:
+        """Uncached body of collect_comprehensive_data"""
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days_back)
         
@@ -108,23 +323,27 @@ class NASADataCollector:
             'metadata': {}
         }
         
-        # Collect CME data with enhanced analysis
-        try:
-            cme_data = await self._fetch_cme_data(start_date, end_date)
-            data_collection['events']['cmes'] = self._analyze_cme_events(cme_data)
-        except Exception as e:
-            data_collection['events']['cmes'] = {'error': str(e), 'count': 0}
+        # DONKI feeds are independent, so fetch them together and analyze each result
+        feeds = (
+            ('cmes', self._fetch_cme_data, self._analyze_cme_events),
+            ('flares', self._fetch_flare_data, self._analyze_flare_events),
+        )
+        results = await asyncio.gather(
+            *(fetch(start_date, end_date) for _, fetch, _ in feeds),
+            return_exceptions=True
+        )
         
-        # Collect Solar Flare data
-        try:
-            flare_data = await self._fetch_flare_data(start_date, end_date)
-            data_collection['events']['flares'] = self._analyze_flare_events(flare_data)
-        except Exception as e:
-            data_collection['events']['flares'] = {'error': str(e), 'count': 0}
+        for (name, _, analyze), result in zip(feeds, results):
+            try:
+                if isinstance(result, BaseException):
+                    raise result
+                data_collection['events'][name] = analyze(result)
+            except Exception as e:
+                data_collection['events'][name] = {'error': str(e), 'count': 0}
         
         # Collect additional space weather indicators
         try:
-            data_collection['events']['space_weather_index'] = await self._calculate_space_weather_index(data_collection)
+            data_collection['events']['space_weather_index'] = self._calculate_space_weather_index(data_collection)
         except Exception as e:
             data_collection['events']['space_weather_index'] = {'error': str(e), 'value': 0}
         
@@ -132,25 +351,52 @@ class NASADataCollector:
     
     async def _fetch_cme_data(self, start_date: datetime, end_date: datetime) -> List[Dict]:
         """Fetch CME data with error handling and retry logic"""
-        params = {
-            'startDate': start_date.strftime('%Y-%m-%d'),
-            'endDate': end_date.strftime('%Y-%m-%d'),
-            'api_key': NASA_API_KEY
-        }
-        
-        response = requests.get(self.base_urls['cme'], params=params, timeout=15)
-        return response.json() if response.status_code == 200 else []
+        return await self._fetch_donki('cme', start_date, end_date)
     
     async def _fetch_flare_data(self, start_date: datetime, end_date: datetime) -> List[Dict]:
         """Fetch solar flare data"""
-        params = {
-            'startDate': start_date.strftime('%Y-%m-%d'),
-            'endDate': end_date.strftime('%Y-%m-%d'),
-            'api_key': NASA_API_KEY
-        }
+        return await self._fetch_donki('flare', start_date, end_date)
+    
+    async def _fetch_donki(self, endpoint: str, start_date: datetime, end_date: datetime) -> List[Dict]:
+        """Fetch a DONKI endpoint for a date range, cached per (endpoint, start, end) day"""
+        start = start_date.strftime('%Y-%m-%d')
+        end = end_date.strftime('%Y-%m-%d')
+        
+        async def fetch():
+            url = self._urls[endpoint].update_query(startDate=start, endDate=end)
+            return await self._request_donki(endpoint, url), True
         
-        response = requests.get(self.base_urls['flare'], params=params, timeout=15)
-        return response.json() if response.status_code == 200 else []
+        return await self._cached((endpoint, start, end), fetch)
+    
+    async def _request_donki(self, endpoint: str, url: yarl.URL) -> List[Dict]:
+        """GET a DONKI endpoint, retrying transient failures; raises DonkiFetchError on failure"""
+        breaker = self._breakers[endpoint]
+        if not breaker.allow():
+            raise DonkiFetchError(f"DONKI {endpoint} circuit open after {breaker.failures} failures")
+        
+        try:
+            for attempt in range(DONKI_RETRY_ATTEMPTS):
+                try:
+                    session = await self._session()
+                    async with self._semaphore, session.get(url) as response:
+                        if response.status == 200:
+                            data = orjson.loads(await response.read())
+                            breaker.record_success()
+                            return data
+                        error = DonkiFetchError(f"DONKI {endpoint} returned HTTP {response.status}")
+                        if response.status < 500 and response.status != 429:
+                            raise error
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    error = e
+                
+                if attempt + 1 < DONKI_RETRY_ATTEMPTS:
+                    await asyncio.sleep(min(DONKI_RETRY_MAX_DELAY, 2 ** attempt) + random.random())
+            
+            breaker.record_failure()
+            raise DonkiFetchError(f"DONKI {endpoint} failed after {DONKI_RETRY_ATTEMPTS} attempts: {error!r}") from error
+        finally:
+            # No-op once record_success/record_failure has settled the trial
+            breaker.release()
     
     def _analyze_cme_events(self, cme_data: List[Dict]) -> Dict[str, Any]:
         """Advanced CME event analysis"""
@@ -167,34 +413,24 @@ class NASADataCollector:
             'predicted_arrivals': []
         }
         
-        speeds = []
-        for cme in cme_data:
-            # Analyze CME characteristics
-            if 'cmeAnalyses' in cme and cme['cmeAnalyses']:
-                for analysis_data in cme['cmeAnalyses']:
-                    if 'speed' in analysis_data and analysis_data['speed']:
-                        speed = float(analysis_data['speed'])
-                        speeds.append(speed)
-                        
-                        # Classify severity based on speed
-                        if speed > 2000:
-                            analysis['severity_distribution']['extreme'] += 1
-                        elif speed > 1000:
-                            analysis['severity_distribution']['high'] += 1
-                        elif speed > 500:
-                            analysis['severity_distribution']['moderate'] += 1
-                        else:
-                            analysis['severity_distribution']['low'] += 1
-                    
-                    # Check if Earth-directed
-                    if 'latitude' in analysis_data and analysis_data['latitude'] is not None:
-                        lat = float(analysis_data['latitude'])
-                        if abs(lat) < 30:  # Rough Earth-directed criterion
-                            analysis['earth_directed'] += 1
+        cme_reduce = _get_cme_reduce()
+        analyses = [a for cme in cme_data for a in (cme.get('cmeAnalyses') or ())]
+        speeds = np.fromiter(
+            (float(a['speed']) for a in analyses if a.get('speed')), dtype=np.float64
+        )
+        latitudes = np.fromiter(
+            (float(a['latitude']) for a in analyses if a.get('latitude') is not None), dtype=np.float64
+        )
+        
+        # Classify severity based on speed: <=500 low, <=1000 moderate, <=2000 high, above extreme;
+        # latitudes within 30 degrees are a rough Earth-directed criterion
+        counts, earth_directed, mean_speed, max_speed = cme_reduce(speeds, latitudes)
+        analysis['severity_distribution'] = dict(zip(_CME_SEVERITY_LEVELS, counts.tolist()))
+        analysis['earth_directed'] = int(earth_directed)
         
-        if speeds:
-            analysis['average_speed'] = sum(speeds) / len(speeds)
-            analysis['fastest_event'] = max(speeds)
+        if speeds.size:
+            analysis['average_speed'] = float(mean_speed)
+            analysis['fastest_event'] = float(max_speed)
         
         analysis['most_recent'] = cme_data[0] if cme_data else None
         
@@ -225,7 +461,7 @@ class NASADataCollector:
         
         return analysis
     
-    async def _calculate_space_weather_index(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_space_weather_index(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate composite space weather activity index"""
         cme_count = data['events'].get('cmes', {}).get('count', 0)
         flare_count = data['events'].get('flares', {}).get('count', 0)
@@ -262,11 +498,69 @@ class NASADataCollector:
             }
         }
 
+# Upper bound on prompt size; larger summaries are reduced to counts and distributions
+PROMPT_TOKEN_BUDGET = 1000
+_SUMMARY_KEEP_KEYS = frozenset((
+    'count', 'severity_distribution', 'class_distribution', 'earth_directed',
+    'x_class_count', 'score', 'level'
+))
+# Shared cl100k encoding: None until first use, False if it could not be loaded
+_tokenizer = None
+
+def _get_tokenizer():
+    """Load the cl100k encoding once; get_encoding downloads it on a cold cache, which may fail"""
+    global _tokenizer
+    if _tokenizer is None:
+        try:
+            _tokenizer = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            print(f"tiktoken encoding unavailable, estimating prompt tokens: {e}")
+            _tokenizer = False
+    return _tokenizer
+
+def _count_tokens(text: str) -> int:
+    """Estimate prompt tokens with one shared cl100k encoding, or ~4 chars/token without it.
+    
+    cl100k is not Claude's tokenizer, but is close enough to enforce a budget.
+    """
+    tokenizer = _get_tokenizer() if TIKTOKEN_AVAILABLE else False
+    if tokenizer:
+        return len(tokenizer.encode(text))
+    return len(text) // 4 + 1
+
+def _shrink_summary(data_summary: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a data summary to counts and histograms only"""
+    shrunk = {}
+    for key, value in data_summary.items():
+        if isinstance(value, dict) and key != 'timeframe':
+            value = {k: v for k, v in value.items() if k in _SUMMARY_KEEP_KEYS}
+        shrunk[key] = value
+    return shrunk
+
+# Static forecast content, shared across requests
+_IMPACTS_HIGH = (
+    {"category": "Satellite Operations", "severity": "HIGH", "probability": 0.8},
+    {"category": "GPS Accuracy", "severity": "MODERATE", "probability": 0.9},
+    {"category": "HF Communications", "severity": "HIGH", "probability": 0.7},
+    {"category": "Aurora Visibility", "severity": "ENHANCED", "probability": 0.95}
+)
+_IMPACTS_MODERATE = (
+    {"category": "Satellite Operations", "severity": "MODERATE", "probability": 0.6},
+    {"category": "Aurora Visibility", "severity": "POSSIBLE", "probability": 0.7}
+)
+_RECOMMENDATIONS = (
+    "Monitor space weather conditions continuously",
+    "Consider postponing sensitive satellite operations during high-risk periods",
+    "Implement enhanced GPS error correction during active periods",
+    "Alert pilots on polar routes of potential HF communication disruptions"
+)
+
 class ClaudeAIAnalyzer:
     """Advanced Claude AI integration for space weather analysis"""
     
     def __init__(self):
-        self.client = anthropic_client
+        self._client = None
+        self._inflight: Dict[bytes, asyncio.Future] = {}
         self.analysis_prompt = """You are an expert space weather analyst working for NASA. Analyze the provided space weather data and create a comprehensive, professional forecast.
 
 CRITICAL INSTRUCTIONS:
@@ -278,48 +572,103 @@ CRITICAL INSTRUCTIONS:
 6. Include confidence levels and uncertainty ranges
 
 Data provided includes CME events, solar flares, and calculated space weather indices. Create a forecast that demonstrates deep understanding of space weather physics and operational impacts."""
+        self._prompt_prefix = f"{self.analysis_prompt}\n\nSpace Weather Data:\n"
 
-    async def generate_ai_forecast(self, space_weather_data: Dict[str, Any]) -> AdvancedForecast:
+    @cached_property
+    def _prompt_tokens(self) -> int:
+        """Token count of the fixed prompt prefix, measured on the first request rather than at import"""
+        return _count_tokens(self._prompt_prefix)
+
+    @property
+    def client(self):
+        """AsyncAnthropic client, created on first use; None when no API key is configured"""
+        if self._client is None and ANTHROPIC_API_KEY:
+            from anthropic import AsyncAnthropic
+            self._client = AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
+        return self._client
+    
+    async def generate_ai_forecast(self, space_weather_data: Dict[str, Any], now: Optional[datetime] = None) -> AdvancedForecast:
         """Generate comprehensive AI-powered forecast using Claude"""
+        now = now or datetime.utcnow()
         
         if not self.client:
-            return self._generate_fallback_forecast(space_weather_data)
+            return self._generate_fallback_forecast(space_weather_data, now)
         
         try:
             # Prepare data for Claude analysis
             data_summary = self._prepare_data_for_analysis(space_weather_data)
             
-            # Generate Claude analysis
-            message = self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=2000,
-                temperature=0.3,
-                messages=[{
-                    "role": "user",
-                    "content": f"{self.analysis_prompt}\n\nSpace Weather Data:\n{json.dumps(data_summary, indent=2)}"
-                }]
+            # Identical concurrent requests share one Claude call
+            key = orjson.dumps(data_summary, default=str, option=orjson.OPT_SORT_KEYS)
+            return await _coalesce(
+                self._inflight, key,
+                lambda: self._generate_claude_forecast(data_summary, space_weather_data, now)
             )
             
-            ai_analysis = message.content[0].text
-            
-            # Parse and structure the AI response
-            return self._structure_ai_response(ai_analysis, space_weather_data)
-            
         except Exception as e:
             print(f"Claude AI analysis failed: {e}")
-            return self._generate_fallback_forecast(space_weather_data)
+            return self._generate_fallback_forecast(space_weather_data, now)
+    
+    async def stream_ai_forecast(self, space_weather_data: Dict[str, Any], now: Optional[datetime] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield ('delta', text) as Claude writes the analysis, then ('forecast', AdvancedForecast)"""
+        now = now or datetime.utcnow()
+        
+        if not self.client:
+            yield 'forecast', self._generate_fallback_forecast(space_weather_data, now)
+            return
+        
+        chunks = []
+        try:
+            data_summary = self._prepare_data_for_analysis(space_weather_data)
+            async with self.client.messages.stream(**self._claude_request(data_summary)) as stream:
+                async for text in stream.text_stream:
+                    chunks.append(text)
+                    yield 'delta', text
+        except Exception as e:
+            print(f"Claude AI analysis failed: {e}")
+            yield 'forecast', self._generate_fallback_forecast(space_weather_data, now)
+            return
+        
+        yield 'forecast', self._structure_ai_response(''.join(chunks), space_weather_data, now)
+    
+    def _claude_request(self, data_summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Model parameters and prompt for a forecast request"""
+        data_json = orjson.dumps(data_summary).decode()
+        if self._prompt_tokens + _count_tokens(data_json) > PROMPT_TOKEN_BUDGET:
+            data_json = orjson.dumps(_shrink_summary(data_summary)).decode()
+        
+        return {
+            "model": "claude-3-5-sonnet-20241022",
+            "max_tokens": 2000,
+            "temperature": 0.3,
+            "messages": [{
+                "role": "user",
+                "content": self._prompt_prefix + data_json
+            }]
+        }
+    
+    async def _generate_claude_forecast(self, data_summary: Dict[str, Any], space_weather_data: Dict[str, Any], now: datetime) -> AdvancedForecast:
+        """Ask Claude to analyze the data summary and structure its reply"""
+        message = await self.client.messages.create(**self._claude_request(data_summary))
+        
+        ai_analysis = message.content[0].text
+        
+        # Parse and structure the AI response
+        return self._structure_ai_response(ai_analysis, space_weather_data, now)
     
     def _prepare_data_for_analysis(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare structured data summary for Claude analysis"""
+        # The raw most-recent CME record is large and adds nothing the aggregates don't
+        cme_analysis = {k: v for k, v in data['events'].get('cmes', {}).items() if k != 'most_recent'}
         return {
             'timeframe': data.get('timeframe', {}),
-            'cme_analysis': data['events'].get('cmes', {}),
+            'cme_analysis': cme_analysis,
             'flare_analysis': data['events'].get('flares', {}),
             'space_weather_index': data['events'].get('space_weather_index', {}),
-            'data_quality': 'high' if not any('error' in event for event in data['events'].values()) else 'partial'
+            'data_quality': 'partial' if _has_event_errors(data) else 'high'
         }
     
-    def _structure_ai_response(self, ai_analysis: str, raw_data: Dict[str, Any]) -> AdvancedForecast:
+    def _structure_ai_response(self, ai_analysis: str, raw_data: Dict[str, Any], now: datetime) -> AdvancedForecast:
         """Structure Claude's analysis into comprehensive forecast format"""
         
         # Extract key components from AI analysis
@@ -339,12 +688,18 @@ Data provided includes CME events, solar flares, and calculated space weather in
         space_weather_index = raw_data['events'].get('space_weather_index', {})
         risk_level = space_weather_index.get('level', 'UNKNOWN')
         
-        forecast_id = f"nasa-ai-forecast-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        forecast_id = f"nasa-ai-forecast-{now.strftime('%Y%m%d-%H%M%S')}"
+        
+        # Executive summary: first 500 characters, cut back to the last word boundary
+        executive_summary = ai_analysis
+        if len(ai_analysis) > 500:
+            cut = ai_analysis.rfind(' ', 0, 500)
+            executive_summary = ai_analysis[:cut if cut > 0 else 500] + "..."
         
         return AdvancedForecast(
             forecast_id=forecast_id,
             title=title,
-            executive_summary=ai_analysis[:500] + "..." if len(ai_analysis) > 500 else ai_analysis,
+            executive_summary=executive_summary,
             detailed_analysis=ai_analysis,
             confidence_score=confidence,
             risk_level=risk_level,
@@ -352,8 +707,8 @@ Data provided includes CME events, solar flares, and calculated space weather in
             risk_assessments=self._extract_risk_assessments(ai_analysis, raw_data),
             evidence_chain=self._build_evidence_chain(raw_data),
             recommendations=self._extract_recommendations(ai_analysis),
-            generated_at=datetime.utcnow().isoformat() + "Z",
-            valid_until=(datetime.utcnow() + timedelta(hours=24)).isoformat() + "Z",
+            generated_at=now.isoformat() + "Z",
+            valid_until=(now + timedelta(hours=24)).isoformat() + "Z",
             data_sources=["NASA DONKI", "EPIC", "AI Analysis"],
             ai_model="Claude-3.5-Sonnet",
             methodology="Multimodal AI analysis with NASA data integration"
@@ -368,33 +723,23 @@ Data provided includes CME events, solar flares, and calculated space weather in
             base_confidence += 0.1
         if data['events'].get('flares', {}).get('count', 0) > 0:
             base_confidence += 0.1
-        if not any('error' in str(event) for event in data['events'].values()):
+        if not _has_event_errors(data):
             base_confidence += 0.1
             
         return min(base_confidence, 0.95)
     
     def _extract_impacts(self, analysis: str, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Extract predicted impacts from AI analysis"""
-        impacts = []
-        
         # Based on space weather index
         index_data = data['events'].get('space_weather_index', {})
         level = index_data.get('level', 'MINIMAL')
         
         if level in ['HIGH', 'EXTREME']:
-            impacts.extend([
-                {"category": "Satellite Operations", "severity": "HIGH", "probability": 0.8},
-                {"category": "GPS Accuracy", "severity": "MODERATE", "probability": 0.9},
-                {"category": "HF Communications", "severity": "HIGH", "probability": 0.7},
-                {"category": "Aurora Visibility", "severity": "ENHANCED", "probability": 0.95}
-            ])
+            return list(_IMPACTS_HIGH)
         elif level == 'MODERATE':
-            impacts.extend([
-                {"category": "Satellite Operations", "severity": "MODERATE", "probability": 0.6},
-                {"category": "Aurora Visibility", "severity": "POSSIBLE", "probability": 0.7}
-            ])
+            return list(_IMPACTS_MODERATE)
         
-        return impacts
+        return []
     
     def _extract_risk_assessments(self, analysis: str, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Extract risk assessments from analysis"""
@@ -443,17 +788,11 @@ Data provided includes CME events, solar flares, and calculated space weather in
     
     def _extract_recommendations(self, analysis: str) -> List[str]:
         """Extract operational recommendations"""
-        recommendations = [
-            "Monitor space weather conditions continuously",
-            "Consider postponing sensitive satellite operations during high-risk periods",
-            "Implement enhanced GPS error correction during active periods",
-            "Alert pilots on polar routes of potential HF communication disruptions"
-        ]
-        
-        return recommendations
+        return list(_RECOMMENDATIONS)
     
-    def _generate_fallback_forecast(self, data: Dict[str, Any]) -> AdvancedForecast:
+    def _generate_fallback_forecast(self, data: Dict[str, Any], now: Optional[datetime] = None) -> AdvancedForecast:
         """Generate forecast without Claude AI (fallback mode)"""
+        now = now or datetime.utcnow()
         index_data = data['events'].get('space_weather_index', {})
         level = index_data.get('level', 'MINIMAL')
         score = index_data.get('score', 0)
@@ -462,7 +801,7 @@ Data provided includes CME events, solar flares, and calculated space weather in
         summary = f"Current space weather index: {score}/100. Activity level: {level}."
         
         return AdvancedForecast(
-            forecast_id=f"fallback-forecast-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
+            forecast_id=f"fallback-forecast-{now.strftime('%Y%m%d-%H%M%S')}",
             title=title,
             executive_summary=summary,
             detailed_analysis=f"Automated analysis indicates {level.lower()} space weather activity based on recent CME and solar flare observations.",
@@ -472,8 +811,8 @@ Data provided includes CME events, solar flares, and calculated space weather in
             risk_assessments=[],
             evidence_chain=self._build_evidence_chain(data),
             recommendations=self._extract_recommendations(""),
-            generated_at=datetime.utcnow().isoformat() + "Z",
-            valid_until=(datetime.utcnow() + timedelta(hours=24)).isoformat() + "Z",
+            generated_at=now.isoformat() + "Z",
+            valid_until=(now + timedelta(hours=24)).isoformat() + "Z",
             data_sources=["NASA DONKI"],
             ai_model="Fallback Analysis",
             methodology="Rule-based analysis"
@@ -482,10 +821,45 @@ Data provided includes CME events, solar flares, and calculated space weather in
 # Initialize services
 nasa_collector = NASADataCollector()
 ai_analyzer = ClaudeAIAnalyzer()
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Worker processes for backfill analysis, started on first use"""
+    global _process_pool
+    if _process_pool is None:
+        # spawn rather than fork: the parent is running an event loop and client threads
+        _process_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+
+def _analyze_day(day: str, cme_data: List[Dict], flare_data: List[Dict], collected_at: str) -> Dict[str, Any]:
+    """Build a one-day collection from that day's DONKI events.
+    
+    Module-level and independent of request state so it pickles into a worker process.
+    """
+    data_collection = {
+        'collection_timestamp': collected_at,
+        'timeframe': {'start': day, 'end': day, 'days_analyzed': 1},
+        'events': {
+            'cmes': nasa_collector._analyze_cme_events(cme_data),
+            'flares': nasa_collector._analyze_flare_events(flare_data)
+        },
+        'metadata': {}
+    }
+    data_collection['events']['space_weather_index'] = nasa_collector._calculate_space_weather_index(data_collection)
+    return data_collection
+
+async def request_time() -> datetime:
+    """Single UTC timestamp shared by everything a request stamps"""
+    return datetime.utcnow()
 
 # API Endpoints
 @app.get("/api/v1/health")
-async def health_check():
+async def health_check(now: datetime = Depends(request_time)):
     """Enhanced health check with system status"""
     return {
         "success": True,
@@ -493,7 +867,7 @@ async def health_check():
             "status": "healthy",
             "service": "nasa-space-weather-ai-forecaster",
             "version": "2.0.0",
-            "ai_status": "enabled" if anthropic_client else "disabled",
+            "ai_status": "enabled" if ANTHROPIC_API_KEY else "disabled",
             "capabilities": [
                 "nasa_data_integration",
                 "ai_powered_analysis", 
@@ -502,23 +876,23 @@ async def health_check():
             ]
         },
         "error": None,
-        "timestamp": datetime.utcnow().isoformat() + "Z"
+        "timestamp": now.isoformat() + "Z"
     }
 
 @app.get("/api/v1/forecasts/advanced")
-async def get_advanced_forecast(days_back: int = 7):
+async def get_advanced_forecast(days_back: int = 7, now: datetime = Depends(request_time)):
     """Generate comprehensive AI-powered space weather forecast"""
     try:
         # Collect comprehensive NASA data
         space_weather_data = await nasa_collector.collect_comprehensive_data(days_back)
         
         # Generate AI forecast
-        forecast = await ai_analyzer.generate_ai_forecast(space_weather_data)
+        forecast = await ai_analyzer.generate_ai_forecast(space_weather_data, now)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": {
-                "forecast": forecast.dict(),
+                "forecast": forecast.model_dump(),
                 "raw_data_summary": {
                     "cme_events": space_weather_data['events'].get('cmes', {}),
                     "flare_events": space_weather_data['events'].get('flares', {}),
@@ -526,23 +900,113 @@ async def get_advanced_forecast(days_back: int = 7):
                 }
             },
             "error": None,
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        }
+            "timestamp": now.isoformat() + "Z"
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Forecast generation failed: {str(e)}")
 
+def _sse_event(event: str, data: Any) -> str:
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+@app.get("/api/v1/forecasts/advanced/stream")
+async def stream_advanced_forecast(days_back: int = 7, now: datetime = Depends(request_time)):
+    """Stream the AI forecast as Server-Sent Events while Claude generates it"""
+    try:
+        space_weather_data = await nasa_collector.collect_comprehensive_data(days_back)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Data collection failed: {str(e)}")
+    
+    async def events():
+        async for kind, payload in ai_analyzer.stream_ai_forecast(space_weather_data, now):
+            if kind == 'delta':
+                yield _sse_event('delta', {"text": payload})
+            else:
+                yield _sse_event('forecast', payload.model_dump())
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+@app.get("/api/v1/forecasts/backfill")
+async def backfill_forecasts(
+    days: int = Query(default=30, ge=1, le=365),
+    include_ai: bool = False,
+    now: datetime = Depends(request_time)
+):
+    """Analyze each of the last `days` days separately, with per-day analysis in worker processes"""
+    try:
+        # One DONKI query per feed for the whole range, then split the events by day
+        start_date = now - timedelta(days=days - 1)
+        cme_data, flare_data = await asyncio.gather(
+            nasa_collector._fetch_cme_data(start_date, now),
+            nasa_collector._fetch_flare_data(start_date, now)
+        )
+        
+        by_day = {
+            (start_date + timedelta(days=i)).strftime('%Y-%m-%d'): ([], [])
+            for i in range(days)
+        }
+        for cme in cme_data:
+            bucket = by_day.get((cme.get('startTime') or '')[:10])
+            if bucket is not None:
+                bucket[0].append(cme)
+        for flare in flare_data:
+            bucket = by_day.get((flare.get('beginTime') or '')[:10])
+            if bucket is not None:
+                bucket[1].append(flare)
+        
+        loop = asyncio.get_running_loop()
+        pool = _get_process_pool()
+        collected_at = now.isoformat()
+        analyses = await asyncio.gather(*(
+            loop.run_in_executor(pool, _analyze_day, day, cmes, flares, collected_at)
+            for day, (cmes, flares) in by_day.items()
+        ))
+        
+        forecasts = [None] * len(analyses)
+        if include_ai:
+            limit = asyncio.Semaphore(BACKFILL_AI_CONCURRENCY)
+            
+            async def limited_forecast(analysis):
+                async with limit:
+                    return await ai_analyzer.generate_ai_forecast(analysis, now)
+            
+            forecasts = await asyncio.gather(*(limited_forecast(analysis) for analysis in analyses))
+        
+        return ORJSONResponse({
+            "success": True,
+            "data": {
+                "days": [
+                    {
+                        "date": day,
+                        "events": analysis['events'],
+                        "forecast": forecast.model_dump() if forecast else None
+                    }
+                    for day, analysis, forecast in zip(by_day, analyses, forecasts)
+                ]
+            },
+            "error": None,
+            "timestamp": now.isoformat() + "Z"
+        })
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Backfill failed: {str(e)}")
+
 @app.get("/api/v1/data/comprehensive")
-async def get_comprehensive_data(days_back: int = 7):
+async def get_comprehensive_data(days_back: int = 7, now: datetime = Depends(request_time)):
     """Get comprehensive space weather data analysis"""
     try:
         data = await nasa_collector.collect_comprehensive_data(days_back)
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": data,
             "error": None,
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        }
+            "timestamp": now.isoformat() + "Z"
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Data collection failed: {str(e)}")
 
@@ -556,6 +1020,8 @@ async def root():
         "endpoints": [
             "/api/v1/health",
             "/api/v1/forecasts/advanced",
+            "/api/v1/forecasts/advanced/stream",
+            "/api/v1/forecasts/backfill",
             "/api/v1/data/comprehensive"
         ],
         "powered_by": "Claude AI + NASA APIs"
@@ -563,4 +1029,13 @@ async def root():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
\ No newline at end of file
+    # uvloop/httptools for throughput; worker count follows uvicorn's WEB_CONCURRENCY convention
+    uvicorn.run(
+        "advanced_forecaster:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        log_level="info"
+    )
\ No newline at end of file
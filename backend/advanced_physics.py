@@ -5,14 +5,87 @@ NASA-grade professional forecasting algorithms
 
 import numpy as np
 import math
-import json
+import numbers
+from bisect import bisect_left, bisect_right
+import os
+import orjson
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass
+from typing import Dict, List, Tuple, Optional, Any, NamedTuple, Sequence, Union
+from dataclasses import dataclass, fields
 import logging
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit: the kernels below run as plain Python"""
+        def decorator(func):
+            return func
+        return decorator
 
 logger = logging.getLogger(__name__)
 
+# Constellations smaller than this per thread are swept on the calling thread
+CONSTELLATION_CHUNK_MIN = 2048
+
+# Physical constants and reference levels shared by the scalar kernels and batch paths
+_MU_EARTH = 3.986e14                 # m³/s², Earth's gravitational parameter
+_EARTH_RADIUS_M = 6.371e6            # m
+_INV_SOLAR_FLUX_REF = 1.0 / 150.0    # 1 / reference F10.7
+_INV_GEOMAG_AP_REF = 1.0 / 15.0      # 1 / reference Ap
+_TWO_PI_OVER_24 = 2.0 * math.pi / 24.0
+
+# Scintillation local-time factor (peak around 22:00) for each minute of the day
+_TIME_FACTOR_LUT = 1 + 0.5 * np.cos(_TWO_PI_OVER_24 * (np.arange(1440) / 60.0 - 22))
+
+# Flare class letters and their intensity multipliers relative to M-class
+_FLARE_CLASS_MULTIPLIERS = {'X': 10.0, 'M': 1.0, 'C': 0.1}
+
+# Level thresholds are tuples for bisect in the scalar methods; the *_ARRAY copies
+# serve np.searchsorted and label fancy-indexing in the batch methods
+
+# NOAA S-scale: 10 MeV proton flux (pfu) at which each level starts
+_S_SCALE_THRESHOLDS = (10.0, 100.0, 1000.0, 10000.0)
+_S_SCALE_LABELS = ('S0', 'S1', 'S2', 'S3', 'S4')
+_S_SCALE_THRESHOLDS_ARRAY = np.array(_S_SCALE_THRESHOLDS)
+_S_SCALE_LABELS_ARRAY = np.array(_S_SCALE_LABELS)
+_RADIATION_RISK_LABELS_ARRAY = np.array(['minimal', 'low', 'moderate', 'high', 'extreme'])
+
+# Drag risk: altitude loss (km/day) above which each level starts
+_DRAG_RISK_THRESHOLDS = (0.01, 0.1, 1.0)
+_DRAG_RISK_LABELS = ('low', 'moderate', 'high', 'extreme')
+_DRAG_RISK_THRESHOLDS_ARRAY = np.array(_DRAG_RISK_THRESHOLDS)
+_DRAG_RISK_LABELS_ARRAY = np.array(_DRAG_RISK_LABELS)
+
+# Substorm intensity and probability for each AE bucket (thresholds come from substorm_params)
+_SUBSTORM_INTENSITY_LABELS = ('quiet', 'weak', 'moderate', 'intense')
+_SUBSTORM_PROBABILITIES = (0.1, 0.4, 0.7, 0.9)
+
+# Scintillation: base probability by distance from the magnetic equator (degrees),
+# geomagnetic factor by Kp, and severity/GNSS impact by S4 index
+_EQUATORIAL_DISTANCE_THRESHOLDS = np.array([20.0, 50.0])
+_SCINTILLATION_BASE_PROBABILITY = np.array([0.8, 0.3, 0.1])
+_KP_THRESHOLDS = np.array([3.0, 5.0, 7.0])
+_SCINTILLATION_GEOMAG_FACTORS = np.array([1.0, 1.5, 2.0, 3.0])
+_SCINTILLATION_SEVERITY_LABELS = np.array(['quiet', 'active', 'severe'])
+_GNSS_IMPACT_LABELS = np.array(['minimal', 'moderate', 'significant'])
+
+# Constant advice returned by reference from the result helpers (immutable, so shareable)
+_AFFECTED_SYSTEMS_HIGH = ('aviation', 'satellites', 'astronauts', 'polar_flights', 'electronics')
+_AFFECTED_SYSTEMS_MODERATE = ('polar_flights', 'satellite_electronics', 'astronaut_eva')
+_AFFECTED_SYSTEMS_NONE = ()
+_FREQUENCIES_SEVERE = ('L1', 'L2', 'L5')
+_FREQUENCIES_ACTIVE = ('L1', 'L2')
+_FREQUENCIES_QUIET = ('L1',)
+_MITIGATION_SEVERE = ('use_multi_frequency', 'increase_update_rate', 'use_inertial_backup')
+_MITIGATION_ACTIVE = ('monitor_signal_quality', 'increase_elevation_mask')
+_MITIGATION_QUIET = ('standard_operations',)
+
 @dataclass
 class SolarParticleEvent:
     """Solar Energetic Particle (SEP) event parameters"""
@@ -45,11 +118,182 @@ class SatelliteOrbitParameters:
     cross_sectional_area: float   # m²
     mass_kg: float
 
+@dataclass(slots=True)
+class SatelliteDragInputs:
+    """The SatelliteOrbitParameters fields the drag model reads"""
+    altitude_km: float
+    cross_sectional_area: float   # m²
+    mass_kg: float
+    
+    @classmethod
+    def from_orbit(cls, orbit: SatelliteOrbitParameters) -> 'SatelliteDragInputs':
+        return cls(orbit.altitude_km, orbit.cross_sectional_area, orbit.mass_kg)
+
+class SatelliteDragInputsSoA(NamedTuple):
+    """SatelliteDragInputs for a whole constellation, one float32 array per field
+    
+    Only the three fields the drag model reads are stored, in single precision;
+    the kernels widen each value to float64 as they compute
+    """
+    altitude_km: np.ndarray
+    cross_sectional_area: np.ndarray
+    mass_kg: np.ndarray
+    
+    @classmethod
+    def from_orbits(cls, orbits: Sequence[Union[SatelliteOrbitParameters, SatelliteDragInputs]]
+                    ) -> 'SatelliteDragInputsSoA':
+        """Transpose a list of per-satellite parameters into contiguous columns"""
+        return cls(*(
+            np.fromiter((getattr(orbit, name) for orbit in orbits), dtype=np.float32, count=len(orbits))
+            for name in cls._fields
+        ))
+
+class _PhysicsResult:
+    """Base for the prediction results: fields left as None are omitted from to_dict()"""
+    __slots__ = ()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict of the fields that are set, for JSON responses"""
+        return {f.name: value for f in fields(self)
+                if (value := getattr(self, f.name)) is not None}
+
+@dataclass(slots=True, frozen=True)
+class SEPResult(_PhysicsResult):
+    """predict_solar_particle_event result"""
+    sep_expected: bool
+    probability: Optional[float] = None
+    reason: Optional[str] = None
+    onset_time: Optional[datetime] = None
+    duration_hours: Optional[float] = None
+    peak_flux_10mev: Optional[float] = None   # pfu
+    peak_flux_50mev: Optional[float] = None   # pfu
+    peak_flux_100mev: Optional[float] = None  # pfu
+    s_scale_rating: Optional[str] = None
+    radiation_risk: Optional[str] = None
+    affected_systems: Optional[Tuple[str, ...]] = None
+    model: Optional[str] = None
+    error: Optional[str] = None
+
+@dataclass(slots=True, frozen=True)
+class SEPBatchResult(_PhysicsResult):
+    """predict_solar_particle_event_batch result, one array per field"""
+    sep_expected: np.ndarray
+    probability: np.ndarray
+    onset_time: np.ndarray        # datetime64[us], NaT where no SEP is expected
+    duration_hours: np.ndarray
+    peak_flux_10mev: np.ndarray
+    peak_flux_50mev: np.ndarray
+    peak_flux_100mev: np.ndarray
+    s_scale_rating: np.ndarray
+    radiation_risk: np.ndarray
+    model: str = 'SEPEM_inspired'
+
+@dataclass(slots=True, frozen=True)
+class SubstormResult(_PhysicsResult):
+    """predict_magnetospheric_substorm result"""
+    substorm_expected: bool
+    probability: Optional[float] = None
+    intensity: Optional[str] = None
+    predicted_ae_index: Optional[float] = None  # nT
+    onset_time: Optional[datetime] = None
+    duration_minutes: Optional[float] = None
+    expansion_phase_minutes: Optional[float] = None
+    recovery_phase_minutes: Optional[float] = None
+    epsilon_parameter: Optional[float] = None
+    auroral_activity: Optional[Dict[str, Any]] = None
+    model: Optional[str] = None
+    error: Optional[str] = None
+
+@dataclass(slots=True, frozen=True)
+class DragResult(_PhysicsResult):
+    """calculate_satellite_drag result"""
+    atmospheric_density: Optional[float] = None
+    density_units: Optional[str] = None
+    drag_force: Optional[float] = None
+    force_units: Optional[str] = None
+    orbital_velocity: Optional[float] = None
+    velocity_units: Optional[str] = None
+    altitude_loss_per_day: Optional[float] = None
+    altitude_units: Optional[str] = None
+    estimated_lifetime_days: Optional[float] = None
+    solar_activity_factor: Optional[float] = None
+    geomagnetic_activity_factor: Optional[float] = None
+    risk_assessment: Optional[str] = None
+    model: Optional[str] = None
+    error: Optional[str] = None
+
+@dataclass(slots=True, frozen=True)
+class DragBatchResult(_PhysicsResult):
+    """calculate_satellite_drag_batch result, one array per per-satellite field"""
+    atmospheric_density: np.ndarray
+    drag_force: np.ndarray
+    orbital_velocity: np.ndarray
+    altitude_loss_per_day: np.ndarray
+    estimated_lifetime_days: np.ndarray
+    solar_activity_factor: float
+    geomagnetic_activity_factor: float
+    risk_assessment: np.ndarray
+    model: str = 'NRLMSISE00_simplified'
+
+@dataclass(slots=True, frozen=True)
+class ScintillationResult(_PhysicsResult):
+    """predict_ionospheric_scintillation result"""
+    scintillation_expected: bool
+    s4_index: Optional[float] = None
+    severity: Optional[str] = None
+    gnss_impact: Optional[str] = None
+    base_probability: Optional[float] = None
+    local_time_factor: Optional[float] = None
+    geomagnetic_factor: Optional[float] = None
+    magnetic_latitude: Optional[float] = None
+    equatorial_distance_deg: Optional[float] = None
+    affected_frequencies: Optional[Tuple[str, ...]] = None
+    mitigation_strategies: Optional[Tuple[str, ...]] = None
+    model: Optional[str] = None
+    error: Optional[str] = None
+
+@dataclass(slots=True, frozen=True)
+class ScintillationBatchResult(_PhysicsResult):
+    """predict_ionospheric_scintillation_batch result, one array per grid point field"""
+    scintillation_expected: np.ndarray
+    s4_index: np.ndarray
+    severity: np.ndarray
+    gnss_impact: np.ndarray
+    base_probability: np.ndarray
+    local_time_factor: np.ndarray
+    geomagnetic_factor: np.ndarray
+    magnetic_latitude: np.ndarray
+    equatorial_distance_deg: np.ndarray
+    model: str = 'SCINDA_inspired'
+
+@dataclass(slots=True, frozen=True)
+class SpaceWeatherForecast:
+    """forecast_all result: the four model results for one observation time"""
+    issued_at: datetime
+    solar_particle_event: SEPResult
+    substorm: SubstormResult
+    satellite_drag: DragResult
+    scintillation: ScintillationResult
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Nested plain dicts, for JSON responses"""
+        return {
+            'issued_at': self.issued_at,
+            'solar_particle_event': self.solar_particle_event.to_dict(),
+            'substorm': self.substorm.to_dict(),
+            'satellite_drag': self.satellite_drag.to_dict(),
+            'scintillation': self.scintillation.to_dict(),
+        }
+
 class AdvancedSpaceWeatherPhysics:
     """Advanced space weather physics models for operational forecasting"""
     
-    def __init__(self):
-        """Initialize advanced physics models with calibrated parameters"""
+    def __init__(self, seed: Optional[int] = None):
+        """Initialize advanced physics models with calibrated parameters
+        
+        seed makes the stochastic terms (SEP flux spread, substorm onset) reproducible
+        """
+        self._rng = np.random.default_rng(seed)
         
         # Solar Particle Event Model Parameters (SEPEM-like)
         self.sep_model_params = {
@@ -88,302 +332,497 @@ class AdvancedSpaceWeatherPhysics:
             'latitude_dependence': 20,      # degrees from magnetic equator
             'local_time_peak': 22,          # hours (local time peak)
         }
+        
+        # Hot-path copies of the parameters above, read once per call as plain attributes
+        self._optimal_longitude = -75.0  # degrees west, best magnetic connection
+        self._flare_eff = self.sep_model_params['flare_efficiency_factor']
+        self._background_flux_10mev = self.sep_model_params['background_flux_10mev']
+        self._ae_thresholds = (
+            float(self.substorm_params['quiet_ae_threshold']),
+            float(self.substorm_params['substorm_ae_threshold']),
+            float(self.substorm_params['intense_substorm_threshold']),
+        )
+        self._sea_level_density = self.atmosphere_params['sea_level_density']
+        self._scale_height_base = self.atmosphere_params['scale_height_base']
+        self._quiet_s4 = self.scintillation_params['quiet_s4_index']
+        self._active_s4 = self.scintillation_params['active_s4_threshold']
+        self._severe_s4 = self.scintillation_params['severe_s4_threshold']
 
     def predict_solar_particle_event(self, flare_class: str, 
                                     flare_longitude: float,
-                                    flare_time: datetime) -> Dict[str, Any]:
+                                    flare_time: datetime) -> SEPResult:
         """
         Predict Solar Energetic Particle (SEP) event using SEPEM-inspired model
         Based on NASA's Space Weather Prediction Center methodology
         """
-        try:
-            # Parse flare class (e.g., "M5.2", "X1.0")
-            if flare_class.upper().startswith('X'):
-                flare_magnitude = float(flare_class[1:])
-                flare_intensity = flare_magnitude * 10  # X-class multiplier
-            elif flare_class.upper().startswith('M'):
-                flare_magnitude = float(flare_class[1:])
-                flare_intensity = flare_magnitude       # M-class baseline
-            elif flare_class.upper().startswith('C'):
-                flare_magnitude = float(flare_class[1:])
-                flare_intensity = flare_magnitude * 0.1 # C-class divider
-            else:
-                flare_intensity = 1.0  # default
-            
-            # Calculate connection probability (depends on longitude)
-            # Best connection at W60-W90 (solar longitude)
-            optimal_longitude = -75  # degrees west
-            longitude_factor = max(0.1, 1.0 - abs(flare_longitude - optimal_longitude) / 90.0)
-            
-            # SEP probability based on flare intensity and connection
-            sep_probability = min(0.95, 
-                                flare_intensity * 0.1 * longitude_factor * 
-                                self.sep_model_params['flare_efficiency_factor'])
-            
-            if sep_probability < 0.1:
-                return {
-                    'sep_expected': False,
-                    'probability': sep_probability,
-                    'reason': 'Flare too weak or poorly connected'
-                }
-            
-            # Calculate expected particle fluxes
-            flux_scaling = flare_intensity * longitude_factor
-            
-            predicted_flux_10mev = (self.sep_model_params['background_flux_10mev'] * 
-                                   flux_scaling * np.random.lognormal(0, 0.5))
-            predicted_flux_50mev = predicted_flux_10mev * 0.3
-            predicted_flux_100mev = predicted_flux_10mev * 0.1
-            
-            # Calculate onset time (30 minutes to 2 hours typical)
-            onset_delay_hours = 0.5 + (2.0 - 0.5) * (1.0 - longitude_factor)
-            onset_time = flare_time + timedelta(hours=onset_delay_hours)
-            
-            # Calculate duration (6-48 hours typical)
-            duration_hours = 12 + flare_intensity * 2
-            
-            # Calculate S-scale rating
-            s_scale = self._calculate_s_scale(predicted_flux_10mev)
-            
-            return {
-                'sep_expected': True,
-                'probability': sep_probability,
-                'onset_time': onset_time,
-                'duration_hours': duration_hours,
-                'peak_flux_10mev': predicted_flux_10mev,
-                'peak_flux_50mev': predicted_flux_50mev,
-                'peak_flux_100mev': predicted_flux_100mev,
-                's_scale_rating': s_scale,
-                'radiation_risk': self._assess_radiation_risk(s_scale),
-                'affected_systems': self._get_affected_systems(s_scale),
-                'model': 'SEPEM_inspired'
-            }
-            
-        except Exception as e:
-            logger.error(f"SEP prediction failed: {e}")
-            return {'sep_expected': False, 'error': str(e)}
+        error = _check_finite(flare_longitude=flare_longitude)
+        if error is None and not isinstance(flare_class, str):
+            error = f"flare_class must be a string, got {flare_class!r}"
+        if error is None and not isinstance(flare_time, datetime):
+            error = f"flare_time must be a datetime, got {flare_time!r}"
+        if error is not None:
+            logger.error("SEP prediction failed: %s", error)
+            return SEPResult(sep_expected=False, error=error)
+        
+        # Parse flare class (e.g., "M5.2", "X1.0")
+        flare_intensity = _parse_flare_class(flare_class)
+        if math.isnan(flare_intensity):
+            error = f"flare_class magnitude is not a number: {flare_class!r}"
+            logger.error("SEP prediction failed: %s", error)
+            return SEPResult(sep_expected=False, error=error)
+        
+        # Calculate connection probability (depends on longitude)
+        # Best connection at W60-W90 (solar longitude)
+        longitude_factor = max(0.1, 1.0 - abs(flare_longitude - self._optimal_longitude) / 90.0)
+        
+        # SEP probability based on flare intensity and connection
+        sep_probability = min(0.95, 
+                            flare_intensity * 0.1 * longitude_factor * self._flare_eff)
+        
+        if sep_probability < 0.1:
+            return SEPResult(
+                sep_expected=False,
+                probability=sep_probability,
+                reason='Flare too weak or poorly connected'
+            )
+        
+        # Calculate expected particle fluxes
+        flux_scaling = flare_intensity * longitude_factor
+        
+        predicted_flux_10mev = (self._background_flux_10mev * 
+                               flux_scaling * self._rng.lognormal(0, 0.5))
+        predicted_flux_50mev = predicted_flux_10mev * 0.3
+        predicted_flux_100mev = predicted_flux_10mev * 0.1
+        
+        # Calculate onset time (30 minutes to 2 hours typical)
+        onset_delay_hours = 0.5 + (2.0 - 0.5) * (1.0 - longitude_factor)
+        onset_time = flare_time + timedelta(hours=onset_delay_hours)
+        
+        # Calculate duration (6-48 hours typical)
+        duration_hours = 12 + flare_intensity * 2
+        
+        # Calculate S-scale rating
+        s_scale = self._calculate_s_scale(predicted_flux_10mev)
+        
+        return SEPResult(
+            sep_expected=True,
+            probability=sep_probability,
+            onset_time=onset_time,
+            duration_hours=duration_hours,
+            peak_flux_10mev=predicted_flux_10mev,
+            peak_flux_50mev=predicted_flux_50mev,
+            peak_flux_100mev=predicted_flux_100mev,
+            s_scale_rating=s_scale,
+            radiation_risk=self._assess_radiation_risk(s_scale),
+            affected_systems=self._get_affected_systems(s_scale),
+            model='SEPEM_inspired'
+        )
+
+    def predict_solar_particle_event_batch(self, flare_classes: List[str],
+                                           flare_longitudes: np.ndarray,
+                                           flare_times: List[datetime]) -> SEPBatchResult:
+        """
+        Vectorized predict_solar_particle_event over a flare catalog
+        Returns per-flare arrays; flux, onset and duration are zero/NaT
+        where no SEP event is expected, and NaN where a flare class failed to parse
+        """
+        n = len(flare_classes)
+        longitudes = np.asarray(flare_longitudes, dtype=np.float64)
+        
+        # Parse flare classes (catalogs repeat a handful of classes, so this is mostly cache hits)
+        flare_intensity = np.fromiter(map(_parse_flare_class, flare_classes), dtype=np.float64, count=n)
+        unparsed = ~np.isfinite(flare_intensity)
+        if unparsed.any():
+            logger.warning("SEP batch: %d of %d flare classes could not be parsed", unparsed.sum(), n)
+        
+        # Connection probability and SEP probability (see predict_solar_particle_event)
+        longitude_factor = np.maximum(0.1, 1.0 - np.abs(longitudes - self._optimal_longitude) / 90.0)
+        sep_probability = np.minimum(
+            0.95,
+            flare_intensity * 0.1 * longitude_factor * self._flare_eff
+        )
+        sep_expected = sep_probability >= 0.1
+        
+        # Expected particle fluxes
+        flux_scaling = flare_intensity * longitude_factor
+        flux_10mev = np.where(
+            sep_expected,
+            self._background_flux_10mev * flux_scaling * self._rng.lognormal(0, 0.5, n),
+            0.0
+        )
+        
+        # Onset 30 minutes to 2 hours after the flare, duration 6-48 hours
+        onset_delay_us = ((0.5 + 1.5 * (1.0 - longitude_factor)) * 3.6e9).astype('timedelta64[us]')
+        onset_time = np.where(
+            sep_expected,
+            np.array(flare_times, dtype='datetime64[us]') + onset_delay_us,
+            np.datetime64('NaT', 'us')
+        )
+        duration_hours = np.where(sep_expected, 12 + flare_intensity * 2, 0.0)
+        
+        s_scale_index = np.searchsorted(_S_SCALE_THRESHOLDS_ARRAY, flux_10mev, side='right')
+        
+        return SEPBatchResult(
+            sep_expected=sep_expected,
+            probability=sep_probability,
+            onset_time=onset_time,
+            duration_hours=duration_hours,
+            peak_flux_10mev=flux_10mev,
+            peak_flux_50mev=flux_10mev * 0.3,
+            peak_flux_100mev=flux_10mev * 0.1,
+            s_scale_rating=_S_SCALE_LABELS_ARRAY[s_scale_index],
+            radiation_risk=_RADIATION_RISK_LABELS_ARRAY[s_scale_index],
+            model='SEPEM_inspired'
+        )
 
     def predict_magnetospheric_substorm(self, solar_wind_velocity: float,
                                       solar_wind_bz: float,
-                                      solar_wind_density: float) -> Dict[str, Any]:
+                                      solar_wind_density: float,
+                                      now: Optional[datetime] = None) -> SubstormResult:
         """
         Predict magnetospheric substorms using AE index model
         Based on Borovsky & Funsten (2003) and Newell & Gjerloev (2011)
+        
+        Onset time is relative to now (default: current UTC time); pass one
+        timestamp when predicting many samples
         """
-        try:
-            # Calculate epsilon parameter (energy input to magnetosphere)
-            # epsilon = v * B² * sin⁴(θ/2) * l₀²
-            velocity_ms = solar_wind_velocity * 1000  # convert to m/s
-            bz_tesla = abs(solar_wind_bz) * 1e-9      # convert to Tesla
-            
-            # Simplified epsilon calculation (proportional to real formula)
-            if solar_wind_bz < 0:  # southward field required
-                epsilon = velocity_ms * (bz_tesla ** 2) * solar_wind_density
-                epsilon_normalized = epsilon * 1e12  # scale to reasonable numbers
-            else:
-                epsilon_normalized = 0
-            
-            # Predict AE index based on epsilon
-            # Empirical relationship: AE ≈ 11.7 * sqrt(epsilon) + background
-            predicted_ae = 11.7 * math.sqrt(max(0, epsilon_normalized)) + 50
-            
-            # Determine substorm likelihood
-            if predicted_ae < self.substorm_params['quiet_ae_threshold']:
-                substorm_probability = 0.1
-                intensity = 'quiet'
-            elif predicted_ae < self.substorm_params['substorm_ae_threshold']:
-                substorm_probability = 0.4
-                intensity = 'weak'
-            elif predicted_ae < self.substorm_params['intense_substorm_threshold']:
-                substorm_probability = 0.7
-                intensity = 'moderate'
-            else:
-                substorm_probability = 0.9
-                intensity = 'intense'
-            
-            # Calculate timing (substorms typically occur 30-90 minutes after trigger)
-            onset_delay_minutes = 45 + np.random.normal(0, 15)
-            onset_time = datetime.utcnow() + timedelta(minutes=max(30, onset_delay_minutes))
-            
-            # Calculate duration
-            duration_minutes = self.substorm_params['typical_duration_minutes']
-            if intensity == 'intense':
-                duration_minutes *= 1.5
-            elif intensity == 'weak':
-                duration_minutes *= 0.7
-            
-            return {
-                'substorm_expected': substorm_probability > 0.5,
-                'probability': substorm_probability,
-                'intensity': intensity,
-                'predicted_ae_index': predicted_ae,
-                'onset_time': onset_time,
-                'duration_minutes': duration_minutes,
-                'expansion_phase_minutes': duration_minutes * self.substorm_params['expansion_fraction'],
-                'recovery_phase_minutes': duration_minutes * self.substorm_params['recovery_fraction'],
-                'epsilon_parameter': epsilon_normalized,
-                'auroral_activity': self._predict_auroral_activity(predicted_ae),
-                'model': 'AE_index_empirical'
-            }
-            
-        except Exception as e:
-            logger.error(f"Substorm prediction failed: {e}")
-            return {'substorm_expected': False, 'error': str(e)}
-
-    def calculate_satellite_drag(self, orbit_params: SatelliteOrbitParameters,
+        error = _check_finite(solar_wind_velocity=solar_wind_velocity,
+                              solar_wind_bz=solar_wind_bz,
+                              solar_wind_density=solar_wind_density)
+        if error is not None:
+            logger.error("Substorm prediction failed: %s", error)
+            return SubstormResult(substorm_expected=False, error=error)
+        
+        # Energy input and AE index (see _substorm_core)
+        predicted_ae, epsilon_normalized = _substorm_core(
+            solar_wind_velocity, solar_wind_bz, solar_wind_density
+        )
+        
+        # Determine substorm likelihood
+        bucket = bisect_right(self._ae_thresholds, predicted_ae)
+        substorm_probability = _SUBSTORM_PROBABILITIES[bucket]
+        intensity = _SUBSTORM_INTENSITY_LABELS[bucket]
+        
+        # Calculate timing (substorms typically occur 30-90 minutes after trigger)
+        onset_delay_minutes = 45 + self._rng.normal(0, 15)
+        onset_time = (now or datetime.utcnow()) + timedelta(minutes=max(30, onset_delay_minutes))
+        
+        # Calculate duration
+        duration_minutes = self.substorm_params['typical_duration_minutes']
+        if intensity == 'intense':
+            duration_minutes *= 1.5
+        elif intensity == 'weak':
+            duration_minutes *= 0.7
+        
+        return SubstormResult(
+            substorm_expected=substorm_probability > 0.5,
+            probability=substorm_probability,
+            intensity=intensity,
+            predicted_ae_index=predicted_ae,
+            onset_time=onset_time,
+            duration_minutes=duration_minutes,
+            expansion_phase_minutes=duration_minutes * self.substorm_params['expansion_fraction'],
+            recovery_phase_minutes=duration_minutes * self.substorm_params['recovery_fraction'],
+            epsilon_parameter=epsilon_normalized,
+            auroral_activity=self._predict_auroral_activity(predicted_ae),
+            model='AE_index_empirical'
+        )
+
+    def calculate_satellite_drag(self, orbit_params: Union[SatelliteOrbitParameters, SatelliteDragInputs],
                                 solar_flux_f107: float,
-                                geomag_ap: float) -> Dict[str, Any]:
+                                geomag_ap: float) -> DragResult:
         """
         Calculate satellite atmospheric drag and orbital decay
         Based on NRLMSISE-00 atmospheric model
         """
-        try:
-            altitude_km = orbit_params.altitude_km
-            
-            # Base atmospheric density calculation
-            # Simplified NRLMSISE-00 model
-            scale_height = self.atmosphere_params['scale_height_base'] * (1 + altitude_km / 1000)
-            
-            # Solar activity effect (F10.7 index)
-            solar_factor = 1 + (solar_flux_f107 - 150) / 150 * 0.5
-            
-            # Geomagnetic activity effect (Ap index)
-            geomag_factor = 1 + (geomag_ap - 15) / 15 * 0.3
-            
-            # Calculate density at altitude
-            base_density = self.atmosphere_params['sea_level_density']
-            density_at_altitude = (base_density * 
-                                 math.exp(-altitude_km / scale_height) * 
-                                 solar_factor * geomag_factor)
-            
-            # Calculate drag force
-            # F_drag = 0.5 * ρ * v² * Cd * A
-            orbital_velocity = math.sqrt(3.986e14 / ((6371 + altitude_km) * 1000))  # m/s
-            drag_coefficient = 2.2  # typical for satellites
-            
-            drag_force = (0.5 * density_at_altitude * 
-                         (orbital_velocity ** 2) * 
-                         drag_coefficient * 
-                         orbit_params.cross_sectional_area)
-            
-            # Calculate orbital decay rate
-            # Simplified calculation for circular orbits
-            energy_loss_rate = drag_force * orbital_velocity
-            orbital_energy = -3.986e14 * orbit_params.mass_kg / (2 * (6371 + altitude_km) * 1000)
-            
-            # Time to decay (very simplified)
-            if energy_loss_rate > 0:
-                decay_time_days = abs(orbital_energy) / (energy_loss_rate * 86400)
-            else:
-                decay_time_days = float('inf')
-            
-            # Altitude loss per day
-            altitude_loss_per_day = altitude_km / max(1, decay_time_days) if decay_time_days < 1e6 else 0
-            
-            return {
-                'atmospheric_density': density_at_altitude,
-                'density_units': 'kg/m³',
-                'drag_force': drag_force,
-                'force_units': 'N',
-                'orbital_velocity': orbital_velocity,
-                'velocity_units': 'm/s',
-                'altitude_loss_per_day': altitude_loss_per_day,
-                'altitude_units': 'km/day',
-                'estimated_lifetime_days': min(decay_time_days, 36500),  # cap at 100 years
-                'solar_activity_factor': solar_factor,
-                'geomagnetic_activity_factor': geomag_factor,
-                'risk_assessment': self._assess_drag_risk(altitude_loss_per_day),
-                'model': 'NRLMSISE00_simplified'
-            }
-            
-        except Exception as e:
-            logger.error(f"Satellite drag calculation failed: {e}")
-            return {'error': str(e)}
+        error = _check_finite(altitude_km=orbit_params.altitude_km,
+                              cross_sectional_area=orbit_params.cross_sectional_area,
+                              mass_kg=orbit_params.mass_kg,
+                              solar_flux_f107=solar_flux_f107,
+                              geomag_ap=geomag_ap)
+        if error is None and orbit_params.altitude_km <= -1000:
+            error = f"altitude_km must be above -1000, got {orbit_params.altitude_km!r}"
+        if error is not None:
+            logger.error("Satellite drag calculation failed: %s", error)
+            return DragResult(error=error)
+        
+        altitude_km = orbit_params.altitude_km
+        
+        # Density, drag and decay (see _drag_core)
+        (density_at_altitude, drag_force, orbital_velocity, decay_time_days,
+         altitude_loss_per_day, solar_factor, geomag_factor) = _drag_core(
+            altitude_km, orbit_params.cross_sectional_area, orbit_params.mass_kg,
+            solar_flux_f107, geomag_ap,
+            self._sea_level_density, self._scale_height_base
+        )
+        
+        return DragResult(
+            atmospheric_density=density_at_altitude,
+            density_units='kg/m³',
+            drag_force=drag_force,
+            force_units='N',
+            orbital_velocity=orbital_velocity,
+            velocity_units='m/s',
+            altitude_loss_per_day=altitude_loss_per_day,
+            altitude_units='km/day',
+            estimated_lifetime_days=min(decay_time_days, 36500),  # cap at 100 years
+            solar_activity_factor=solar_factor,
+            geomagnetic_activity_factor=geomag_factor,
+            risk_assessment=self._assess_drag_risk(altitude_loss_per_day),
+            model='NRLMSISE00_simplified'
+        )
+
+    def calculate_satellite_drag_batch(self, orbits: SatelliteDragInputsSoA,
+                                       solar_flux_f107: float,
+                                       geomag_ap: float) -> DragBatchResult:
+        """
+        Vectorized calculate_satellite_drag over a constellation
+        Returns per-satellite arrays (units as in calculate_satellite_drag)
+        """
+        if NUMBA_AVAILABLE:
+            # Compiled loop over _drag_core; runs without the GIL
+            (density_at_altitude, drag_force, orbital_velocity, decay_time_days,
+             altitude_loss_per_day) = _drag_core_batch(
+                orbits.altitude_km, orbits.cross_sectional_area, orbits.mass_kg,
+                solar_flux_f107, geomag_ap, self._sea_level_density, self._scale_height_base
+            )
+            return DragBatchResult(
+                atmospheric_density=density_at_altitude,
+                drag_force=drag_force,
+                orbital_velocity=orbital_velocity,
+                altitude_loss_per_day=altitude_loss_per_day,
+                estimated_lifetime_days=np.minimum(decay_time_days, 36500),  # cap at 100 years
+                solar_activity_factor=1 + (solar_flux_f107 * _INV_SOLAR_FLUX_REF - 1) * 0.5,
+                geomagnetic_activity_factor=1 + (geomag_ap * _INV_GEOMAG_AP_REF - 1) * 0.3,
+                risk_assessment=_DRAG_RISK_LABELS_ARRAY[np.searchsorted(_DRAG_RISK_THRESHOLDS_ARRAY, altitude_loss_per_day)]
+            )
+        
+        (density_at_altitude, drag_force, orbital_velocity, decay_time_days,
+         altitude_loss_per_day, solar_factor, geomag_factor) = self._drag_arrays(
+            *(np.asarray(column, dtype=np.float64) for column in orbits),
+            solar_flux_f107, geomag_ap
+        )
+        
+        return DragBatchResult(
+            atmospheric_density=density_at_altitude,
+            drag_force=drag_force,
+            orbital_velocity=orbital_velocity,
+            altitude_loss_per_day=altitude_loss_per_day,
+            estimated_lifetime_days=np.minimum(decay_time_days, 36500),  # cap at 100 years
+            solar_activity_factor=solar_factor,
+            geomagnetic_activity_factor=geomag_factor,
+            risk_assessment=_DRAG_RISK_LABELS_ARRAY[np.searchsorted(_DRAG_RISK_THRESHOLDS_ARRAY, altitude_loss_per_day)],
+            model='NRLMSISE00_simplified'
+        )
+
+    def calculate_satellite_drag_constellation(self, orbits: SatelliteDragInputsSoA,
+                                               solar_flux_f107: float,
+                                               geomag_ap: float,
+                                               n_threads: Optional[int] = None) -> DragBatchResult:
+        """
+        calculate_satellite_drag_batch split into chunks across a thread pool
+        The compiled drag loop (and NumPy's ufuncs) run without the GIL, so
+        chunks proceed in parallel; n_threads defaults to the CPU count
+        """
+        n_threads = min(n_threads or os.cpu_count() or 1,
+                        max(1, len(orbits.altitude_km) // CONSTELLATION_CHUNK_MIN))
+        if n_threads == 1:
+            return self.calculate_satellite_drag_batch(orbits, solar_flux_f107, geomag_ap)
+        
+        chunks = zip(*(np.array_split(column, n_threads) for column in orbits))
+        with ThreadPoolExecutor(max_workers=n_threads) as pool:
+            results = list(pool.map(
+                lambda chunk: self.calculate_satellite_drag_batch(
+                    SatelliteDragInputsSoA(*chunk), solar_flux_f107, geomag_ap
+                ),
+                chunks
+            ))
+        
+        first = results[0]
+        return DragBatchResult(
+            atmospheric_density=np.concatenate([r.atmospheric_density for r in results]),
+            drag_force=np.concatenate([r.drag_force for r in results]),
+            orbital_velocity=np.concatenate([r.orbital_velocity for r in results]),
+            altitude_loss_per_day=np.concatenate([r.altitude_loss_per_day for r in results]),
+            estimated_lifetime_days=np.concatenate([r.estimated_lifetime_days for r in results]),
+            solar_activity_factor=first.solar_activity_factor,
+            geomagnetic_activity_factor=first.geomagnetic_activity_factor,
+            risk_assessment=np.concatenate([r.risk_assessment for r in results])
+        )
+
+    def _drag_arrays(self, altitude_km, cross_sectional_area, mass_kg, solar_flux_f107, geomag_ap):
+        """NumPy version of _drag_core; all inputs broadcast against each other"""
+        radius_m = _EARTH_RADIUS_M + altitude_km * 1000
+        
+        scale_height = self._scale_height_base * (1 + altitude_km / 1000)
+        solar_factor = 1 + (solar_flux_f107 * _INV_SOLAR_FLUX_REF - 1) * 0.5
+        geomag_factor = 1 + (geomag_ap * _INV_GEOMAG_AP_REF - 1) * 0.3
+        
+        density_at_altitude = (self._sea_level_density *
+                               np.exp(-altitude_km / scale_height) *
+                               solar_factor * geomag_factor)
+        orbital_velocity = np.sqrt(_MU_EARTH / radius_m)
+        drag_force = 0.5 * density_at_altitude * orbital_velocity ** 2 * 2.2 * cross_sectional_area
+        
+        energy_loss_rate = drag_force * orbital_velocity
+        orbital_energy = -_MU_EARTH * mass_kg / (2 * radius_m)
+        with np.errstate(divide='ignore'):
+            decay_time_days = np.where(
+                energy_loss_rate > 0, np.abs(orbital_energy) / (energy_loss_rate * 86400), np.inf
+            )
+        altitude_loss_per_day = np.where(
+            decay_time_days < 1e6, altitude_km / np.maximum(1, decay_time_days), 0.0
+        )
+        
+        return (density_at_altitude, drag_force, orbital_velocity, decay_time_days,
+                altitude_loss_per_day, solar_factor, geomag_factor)
 
     def predict_ionospheric_scintillation(self, latitude_deg: float,
                                         longitude_deg: float,
                                         local_time_hours: float,
-                                        kp_index: float) -> Dict[str, Any]:
+                                        kp_index: float) -> ScintillationResult:
         """
         Predict ionospheric scintillation effects on GNSS
         Based on SCINDA and COSMIC models
         """
-        try:
-            # Calculate magnetic latitude (simplified)
-            magnetic_latitude = latitude_deg - 11.5  # approximate magnetic declination
-            
-            # Distance from magnetic equator
-            equatorial_distance = abs(magnetic_latitude)
-            
-            # Base scintillation probability (higher near magnetic equator)
-            if equatorial_distance < 20:
-                base_probability = 0.8  # equatorial anomaly region
-            elif equatorial_distance < 50:
-                base_probability = 0.3  # mid-latitude
-            else:
-                base_probability = 0.1  # high latitude
-            
-            # Local time effect (peak around 22:00 local time)
-            time_factor = 1 + 0.5 * math.cos(2 * math.pi * (local_time_hours - 22) / 24)
-            
-            # Geomagnetic activity effect
-            if kp_index <= 3:
-                geomag_factor = 1.0
-            elif kp_index <= 5:
-                geomag_factor = 1.5
-            elif kp_index <= 7:
-                geomag_factor = 2.0
-            else:
-                geomag_factor = 3.0
-            
-            # Calculate S4 scintillation index
-            s4_index = (self.scintillation_params['quiet_s4_index'] * 
-                       base_probability * time_factor * geomag_factor)
-            s4_index = min(1.0, s4_index)  # cap at 1.0
-            
-            # Determine severity
-            if s4_index < self.scintillation_params['active_s4_threshold']:
-                severity = 'quiet'
-                gnss_impact = 'minimal'
-            elif s4_index < self.scintillation_params['severe_s4_threshold']:
-                severity = 'active'
-                gnss_impact = 'moderate'
-            else:
-                severity = 'severe'
-                gnss_impact = 'significant'
-            
-            return {
-                'scintillation_expected': s4_index > 0.2,
-                's4_index': s4_index,
-                'severity': severity,
-                'gnss_impact': gnss_impact,
-                'base_probability': base_probability,
-                'local_time_factor': time_factor,
-                'geomagnetic_factor': geomag_factor,
-                'magnetic_latitude': magnetic_latitude,
-                'equatorial_distance_deg': equatorial_distance,
-                'affected_frequencies': self._get_affected_frequencies(s4_index),
-                'mitigation_strategies': self._get_scintillation_mitigation(severity),
-                'model': 'SCINDA_inspired'
-            }
-            
-        except Exception as e:
-            logger.error(f"Scintillation prediction failed: {e}")
-            return {'scintillation_expected': False, 'error': str(e)}
+        error = _check_finite(latitude_deg=latitude_deg,
+                              local_time_hours=local_time_hours,
+                              kp_index=kp_index)
+        if error is not None:
+            logger.error("Scintillation prediction failed: %s", error)
+            return ScintillationResult(scintillation_expected=False, error=error)
+        
+        # S4 scintillation index and its factors (see _scintillation_core)
+        (s4_index, base_probability, time_factor, geomag_factor,
+         magnetic_latitude, equatorial_distance) = _scintillation_core(
+            latitude_deg, local_time_hours, kp_index,
+            self._quiet_s4
+        )
+        
+        # Determine severity
+        if s4_index < self._active_s4:
+            severity = 'quiet'
+            gnss_impact = 'minimal'
+        elif s4_index < self._severe_s4:
+            severity = 'active'
+            gnss_impact = 'moderate'
+        else:
+            severity = 'severe'
+            gnss_impact = 'significant'
+        
+        return ScintillationResult(
+            scintillation_expected=s4_index > 0.2,
+            s4_index=s4_index,
+            severity=severity,
+            gnss_impact=gnss_impact,
+            base_probability=base_probability,
+            local_time_factor=time_factor,
+            geomagnetic_factor=geomag_factor,
+            magnetic_latitude=magnetic_latitude,
+            equatorial_distance_deg=equatorial_distance,
+            affected_frequencies=self._get_affected_frequencies(s4_index),
+            mitigation_strategies=self._get_scintillation_mitigation(severity),
+            model='SCINDA_inspired'
+        )
+
+    def predict_ionospheric_scintillation_batch(self, latitude_deg: np.ndarray,
+                                              longitude_deg: np.ndarray,
+                                              local_time_hours: np.ndarray,
+                                              kp_index: np.ndarray) -> ScintillationBatchResult:
+        """
+        Vectorized predict_ionospheric_scintillation over a forecast grid
+        Inputs broadcast against each other; returns per-point arrays
+        """
+        latitude_deg, local_time_hours, kp_index = np.broadcast_arrays(
+            np.asarray(latitude_deg, dtype=np.float64),
+            np.asarray(local_time_hours, dtype=np.float64),
+            np.asarray(kp_index, dtype=np.float64)
+        )
+        
+        magnetic_latitude = latitude_deg - 11.5
+        equatorial_distance = np.abs(magnetic_latitude)
+        base_probability = _SCINTILLATION_BASE_PROBABILITY[
+            np.searchsorted(_EQUATORIAL_DISTANCE_THRESHOLDS, equatorial_distance, side='right')
+        ]
+        time_factor = _TIME_FACTOR_LUT[np.floor(local_time_hours * 60).astype(np.int64) % 1440]
+        geomag_factor = _SCINTILLATION_GEOMAG_FACTORS[np.searchsorted(_KP_THRESHOLDS, kp_index)]
+        
+        s4_index = np.minimum(1.0, self._quiet_s4 * base_probability * time_factor * geomag_factor)
+        severity_index = np.searchsorted([self._active_s4, self._severe_s4], s4_index, side='right')
+        
+        return ScintillationBatchResult(
+            scintillation_expected=s4_index > 0.2,
+            s4_index=s4_index,
+            severity=_SCINTILLATION_SEVERITY_LABELS[severity_index],
+            gnss_impact=_GNSS_IMPACT_LABELS[severity_index],
+            base_probability=base_probability,
+            local_time_factor=time_factor,
+            geomagnetic_factor=geomag_factor,
+            magnetic_latitude=magnetic_latitude,
+            equatorial_distance_deg=equatorial_distance
+        )
+
+    def forecast_all(self, solar_flux_f107: float, geomag_ap: float, kp_index: float,
+                     solar_wind_bz: float, solar_wind_velocity: float, solar_wind_density: float,
+                     latitude_deg: float, longitude_deg: float, local_time_hours: float,
+                     flare_class: str, flare_longitude: float,
+                     now: Optional[datetime] = None,
+                     orbit_params: Optional[Union[SatelliteOrbitParameters, SatelliteDragInputs]] = None
+                     ) -> SpaceWeatherForecast:
+        """
+        Run all four models for one observation time
+        The flare is taken to erupt at now (default: current UTC time); drag is
+        computed for orbit_params, or the sample ISS-like satellite
+        """
+        now = now or datetime.utcnow()
+        return SpaceWeatherForecast(
+            issued_at=now,
+            solar_particle_event=self.predict_solar_particle_event(flare_class, flare_longitude, now),
+            substorm=self.predict_magnetospheric_substorm(
+                solar_wind_velocity, solar_wind_bz, solar_wind_density, now=now
+            ),
+            satellite_drag=self.calculate_satellite_drag(
+                orbit_params or _SAMPLE_DRAG_INPUTS, solar_flux_f107, geomag_ap
+            ),
+            scintillation=self.predict_ionospheric_scintillation(
+                latitude_deg, longitude_deg, local_time_hours, kp_index
+            )
+        )
+
+    # Ensemble forecasts: one vectorized pass over the perturbed inputs, summarized as
+    # (median, 16th percentile, 84th percentile), i.e. the median and a 1-sigma band
+    def predict_solar_particle_event_ensemble(self, flare_class: str,
+                                              longitude_samples: np.ndarray,
+                                              flare_time: datetime) -> Tuple[float, float, float]:
+        """Peak 10 MeV flux (pfu) over perturbed source longitudes, e.g. flare_longitude + [0, ±1, ±2.5, ±5]"""
+        n = len(longitude_samples)
+        batch = self.predict_solar_particle_event_batch([flare_class] * n, longitude_samples, [flare_time] * n)
+        return _ensemble_quantiles(batch.peak_flux_10mev)
+
+    def calculate_satellite_drag_ensemble(self, orbit_params: SatelliteOrbitParameters,
+                                          f107_samples: np.ndarray,
+                                          ap_samples: np.ndarray) -> Tuple[float, float, float]:
+        """Altitude loss (km/day) over joint F10.7/Ap samples (paired, or broadcast against each other)"""
+        altitude_loss_per_day = self._drag_arrays(
+            orbit_params.altitude_km, orbit_params.cross_sectional_area, orbit_params.mass_kg,
+            np.asarray(f107_samples, dtype=np.float64), np.asarray(ap_samples, dtype=np.float64)
+        )[4]
+        return _ensemble_quantiles(altitude_loss_per_day)
+
+    def predict_ionospheric_scintillation_ensemble(self, latitude_deg: float,
+                                                   longitude_deg: float,
+                                                   local_time_hours: float,
+                                                   kp_samples: np.ndarray) -> Tuple[float, float, float]:
+        """S4 index over Kp samples at one location"""
+        batch = self.predict_ionospheric_scintillation_batch(
+            latitude_deg, longitude_deg, local_time_hours, kp_samples
+        )
+        return _ensemble_quantiles(batch.s4_index)
 
     # Helper methods
     def _calculate_s_scale(self, flux_10mev: float) -> str:
         """Calculate NOAA S-scale from 10 MeV proton flux"""
-        if flux_10mev >= 10000:
-            return 'S4'
-        elif flux_10mev >= 1000:
-            return 'S3'
-        elif flux_10mev >= 100:
-            return 'S2'
-        elif flux_10mev >= 10:
-            return 'S1'
-        else:
-            return 'S0'
+        return _S_SCALE_LABELS[bisect_right(_S_SCALE_THRESHOLDS, flux_10mev)]
     
     def _assess_radiation_risk(self, s_scale: str) -> str:
         """Assess radiation risk for different systems"""
@@ -396,14 +835,14 @@ class AdvancedSpaceWeatherPhysics:
         }
         return risk_levels.get(s_scale, 'unknown')
     
-    def _get_affected_systems(self, s_scale: str) -> List[str]:
+    def _get_affected_systems(self, s_scale: str) -> Tuple[str, ...]:
         """Get systems affected by solar particle radiation"""
-        if s_scale in ['S3', 'S4']:
-            return ['aviation', 'satellites', 'astronauts', 'polar_flights', 'electronics']
-        elif s_scale in ['S1', 'S2']:
-            return ['polar_flights', 'satellite_electronics', 'astronaut_eva']
+        if s_scale in ('S3', 'S4'):
+            return _AFFECTED_SYSTEMS_HIGH
+        elif s_scale in ('S1', 'S2'):
+            return _AFFECTED_SYSTEMS_MODERATE
         else:
-            return []
+            return _AFFECTED_SYSTEMS_NONE
     
     def _predict_auroral_activity(self, ae_index: float) -> Dict[str, Any]:
         """Predict auroral activity from AE index"""
@@ -416,32 +855,187 @@ class AdvancedSpaceWeatherPhysics:
     
     def _assess_drag_risk(self, altitude_loss_per_day: float) -> str:
         """Assess satellite drag risk"""
-        if altitude_loss_per_day > 1.0:
-            return 'extreme'
-        elif altitude_loss_per_day > 0.1:
-            return 'high'
-        elif altitude_loss_per_day > 0.01:
-            return 'moderate'
-        else:
-            return 'low'
+        return _DRAG_RISK_LABELS[bisect_left(_DRAG_RISK_THRESHOLDS, altitude_loss_per_day)]
     
-    def _get_affected_frequencies(self, s4_index: float) -> List[str]:
+    def _get_affected_frequencies(self, s4_index: float) -> Tuple[str, ...]:
         """Get GNSS frequencies affected by scintillation"""
         if s4_index > 0.6:
-            return ['L1', 'L2', 'L5']
+            return _FREQUENCIES_SEVERE
         elif s4_index > 0.3:
-            return ['L1', 'L2']
+            return _FREQUENCIES_ACTIVE
         else:
-            return ['L1']
+            return _FREQUENCIES_QUIET
     
-    def _get_scintillation_mitigation(self, severity: str) -> List[str]:
+    def _get_scintillation_mitigation(self, severity: str) -> Tuple[str, ...]:
         """Get mitigation strategies for scintillation"""
         if severity == 'severe':
-            return ['use_multi_frequency', 'increase_update_rate', 'use_inertial_backup']
+            return _MITIGATION_SEVERE
         elif severity == 'active':
-            return ['monitor_signal_quality', 'increase_elevation_mask']
+            return _MITIGATION_ACTIVE
         else:
-            return ['standard_operations']
+            return _MITIGATION_QUIET
+
+# Numeric kernels: scalar float math only, so Numba can compile them when installed.
+# Explicit float64 signatures compile them eagerly at import (and cache the machine
+# code on disk), so the first forecast does not pay the JIT warm-up.
+
+@njit("UniTuple(float64, 2)(float64, float64, float64)", cache=True, fastmath=True)
+def _substorm_core(solar_wind_velocity, solar_wind_bz, solar_wind_density):
+    """Return (predicted AE index in nT, normalized epsilon coupling parameter)"""
+    # Calculate epsilon parameter (energy input to magnetosphere)
+    # epsilon = v * B² * sin⁴(θ/2) * l₀²
+    velocity_ms = solar_wind_velocity * 1000  # convert to m/s
+    bz_tesla = abs(solar_wind_bz) * 1e-9      # convert to Tesla
+    
+    # Simplified epsilon calculation (proportional to real formula)
+    if solar_wind_bz < 0:  # southward field required
+        epsilon = velocity_ms * (bz_tesla ** 2) * solar_wind_density
+        epsilon_normalized = epsilon * 1e12  # scale to reasonable numbers
+    else:
+        epsilon_normalized = 0.0
+    
+    # Predict AE index based on epsilon
+    # Empirical relationship: AE ≈ 11.7 * sqrt(epsilon) + background
+    predicted_ae = 11.7 * math.sqrt(max(0.0, epsilon_normalized)) + 50
+    return predicted_ae, epsilon_normalized
+
+@njit("UniTuple(float64, 7)(float64, float64, float64, float64, float64, float64, float64)",
+      cache=True, nogil=True)
+def _drag_core(altitude_km, cross_sectional_area, mass_kg, solar_flux_f107, geomag_ap,
+               sea_level_density, scale_height_base):
+    """Return (density, drag force, orbital velocity, decay time in days,
+    altitude loss per day, solar factor, geomagnetic factor)"""
+    # Base atmospheric density calculation
+    # Simplified NRLMSISE-00 model
+    scale_height = scale_height_base * (1 + altitude_km / 1000)
+    
+    # Solar activity effect (F10.7 index)
+    solar_factor = 1 + (solar_flux_f107 * _INV_SOLAR_FLUX_REF - 1) * 0.5
+    
+    # Geomagnetic activity effect (Ap index)
+    geomag_factor = 1 + (geomag_ap * _INV_GEOMAG_AP_REF - 1) * 0.3
+    
+    # Calculate density at altitude
+    density_at_altitude = (sea_level_density *
+                           math.exp(-altitude_km / scale_height) *
+                           solar_factor * geomag_factor)
+    
+    # Calculate drag force
+    # F_drag = 0.5 * ρ * v² * Cd * A
+    radius_m = _EARTH_RADIUS_M + altitude_km * 1000
+    orbital_velocity = math.sqrt(_MU_EARTH / radius_m)  # m/s
+    drag_coefficient = 2.2  # typical for satellites
+    
+    drag_force = (0.5 * density_at_altitude *
+                  (orbital_velocity ** 2) *
+                  drag_coefficient *
+                  cross_sectional_area)
+    
+    # Calculate orbital decay rate
+    # Simplified calculation for circular orbits
+    energy_loss_rate = drag_force * orbital_velocity
+    orbital_energy = -_MU_EARTH * mass_kg / (2 * radius_m)
+    
+    # Time to decay (very simplified)
+    if energy_loss_rate > 0:
+        decay_time_days = abs(orbital_energy) / (energy_loss_rate * 86400)
+    else:
+        decay_time_days = math.inf
+    
+    # Altitude loss per day
+    altitude_loss_per_day = altitude_km / max(1.0, decay_time_days) if decay_time_days < 1e6 else 0.0
+    
+    return (density_at_altitude, drag_force, orbital_velocity, decay_time_days,
+            altitude_loss_per_day, solar_factor, geomag_factor)
+
+@njit(["UniTuple(float64[:], 5)(float32[:], float32[:], float32[:], float64, float64, float64, float64)",
+       "UniTuple(float64[:], 5)(float64[:], float64[:], float64[:], float64, float64, float64, float64)"],
+      cache=True, nogil=True)
+def _drag_core_batch(altitude_km, cross_sectional_area, mass_kg, solar_flux_f107, geomag_ap,
+                     sea_level_density, scale_height_base):
+    """_drag_core over per-satellite float32 or float64 arrays; returns (density, drag force,
+    orbital velocity, decay time in days, altitude loss per day) arrays"""
+    n = altitude_km.size
+    density = np.empty(n)
+    drag_force = np.empty(n)
+    orbital_velocity = np.empty(n)
+    decay_time_days = np.empty(n)
+    altitude_loss_per_day = np.empty(n)
+    for i in range(n):
+        (density[i], drag_force[i], orbital_velocity[i], decay_time_days[i],
+         altitude_loss_per_day[i], _, _) = _drag_core(
+            altitude_km[i], cross_sectional_area[i], mass_kg[i], solar_flux_f107, geomag_ap,
+            sea_level_density, scale_height_base
+        )
+    return density, drag_force, orbital_velocity, decay_time_days, altitude_loss_per_day
+
+@njit("UniTuple(float64, 6)(float64, float64, float64, float64)", cache=True, fastmath=True)
+def _scintillation_core(latitude_deg, local_time_hours, kp_index, quiet_s4_index):
+    """Return (S4 index, base probability, local time factor, geomagnetic factor,
+    magnetic latitude, distance from the magnetic equator)"""
+    # Calculate magnetic latitude (simplified)
+    magnetic_latitude = latitude_deg - 11.5  # approximate magnetic declination
+    
+    # Distance from magnetic equator
+    equatorial_distance = abs(magnetic_latitude)
+    
+    # Base scintillation probability (higher near magnetic equator)
+    if equatorial_distance < 20:
+        base_probability = 0.8  # equatorial anomaly region
+    elif equatorial_distance < 50:
+        base_probability = 0.3  # mid-latitude
+    else:
+        base_probability = 0.1  # high latitude
+    
+    # Local time effect (peak around 22:00 local time), looked up by minute of day
+    time_factor = float(_TIME_FACTOR_LUT[int(math.floor(local_time_hours * 60)) % 1440])
+    
+    # Geomagnetic activity effect
+    if kp_index <= 3:
+        geomag_factor = 1.0
+    elif kp_index <= 5:
+        geomag_factor = 1.5
+    elif kp_index <= 7:
+        geomag_factor = 2.0
+    else:
+        geomag_factor = 3.0
+    
+    # Calculate S4 scintillation index
+    s4_index = quiet_s4_index * base_probability * time_factor * geomag_factor
+    s4_index = min(1.0, s4_index)  # cap at 1.0
+    
+    return (s4_index, base_probability, time_factor, geomag_factor,
+            magnetic_latitude, equatorial_distance)
+
+def _check_finite(**values) -> Optional[str]:
+    """Error message for the first input that is not a finite real number, else None"""
+    for name, value in values.items():
+        if not isinstance(value, numbers.Real) or not math.isfinite(value):
+            return f"{name} must be a finite number, got {value!r}"
+    return None
+
+def _ensemble_quantiles(values: np.ndarray) -> Tuple[float, float, float]:
+    """(median, 16th percentile, 84th percentile) of an ensemble"""
+    median, low, high = np.quantile(values, [0.5, 0.16, 0.84])
+    return float(median), float(low), float(high)
+
+@lru_cache(maxsize=1024)
+def _parse_flare_class(flare_class: str) -> float:
+    """Flare intensity relative to M1.0 (e.g. "X1.5" -> 15.0)
+    
+    Unknown class letters count as 1.0; NaN if the magnitude is not a number
+    """
+    multiplier = _FLARE_CLASS_MULTIPLIERS.get(flare_class[:1].upper())
+    if multiplier is None:
+        return 1.0
+    return _parse_float(flare_class[1:]) * multiplier
+
+def _parse_float(text: str) -> float:
+    """float(text), or NaN if text is not a number"""
+    try:
+        return float(text)
+    except ValueError:
+        return math.nan
 
 # Convenience functions for integration
 def create_sample_satellite() -> SatelliteOrbitParameters:
@@ -455,23 +1049,26 @@ def create_sample_satellite() -> SatelliteOrbitParameters:
         mass_kg=1000.0
     )
 
+_SAMPLE_DRAG_INPUTS = SatelliteDragInputs.from_orbit(create_sample_satellite())
+
 if __name__ == "__main__":
     # Test the advanced physics models
     physics = AdvancedSpaceWeatherPhysics()
+    dump_options = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
     
     # Test SEP prediction
     sep_result = physics.predict_solar_particle_event("X1.5", -75, datetime.utcnow())
-    print("SEP Prediction:", json.dumps(sep_result, indent=2, default=str))
+    print("SEP Prediction:", orjson.dumps(sep_result.to_dict(), option=dump_options).decode())
     
     # Test substorm prediction
     substorm_result = physics.predict_magnetospheric_substorm(500, -10, 5.0)
-    print("Substorm Prediction:", json.dumps(substorm_result, indent=2, default=str))
+    print("Substorm Prediction:", orjson.dumps(substorm_result.to_dict(), option=dump_options).decode())
     
     # Test satellite drag
     satellite = create_sample_satellite()
     drag_result = physics.calculate_satellite_drag(satellite, 180, 25)
-    print("Satellite Drag:", json.dumps(drag_result, indent=2, default=str))
+    print("Satellite Drag:", orjson.dumps(drag_result.to_dict(), option=dump_options).decode())
     
     # Test scintillation
     scint_result = physics.predict_ionospheric_scintillation(0, -60, 22, 6)
-    print("Scintillation:", json.dumps(scint_result, indent=2, default=str))
\ No newline at end of file
+    print("Scintillation:", orjson.dumps(scint_result.to_dict(), option=dump_options).decode())
\ No newline at end of file
@@ -3,29 +3,45 @@ FastAPI server for NASA Space Weather Forecaster
 Provides REST API endpoints for forecast data and real-time updates
 """
 
-import os
-import json
-import asyncio
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import AsyncIterator, List, Any, Optional, Dict, Set, Tuple
+from datetime import datetime
 from contextlib import asynccontextmanager
+from functools import lru_cache
+import asyncio
+import os
+import time
+
+import orjson
+from email_validator import validate_email, EmailNotValidError
 
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, BackgroundTasks, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 import uvicorn
 
 # Import our modules
-from backend.schema import ForecastBundle, ForecastError, Forecast
-from backend.forecaster import SpaceWeatherForecaster, ForecastConfig, run_forecast
-from backend.database import DatabaseManager, ForecastRecord, AlertRecord
-from backend.monitor import MonitorService
+# The forecaster stack (NASA client, Claude client) is imported lazily where it
+# is used so that importing the app and serving cheap endpoints stays fast.
+from backend.schema import ForecastBundle
+from backend.database import DatabaseManager
 from backend.notifications import NotificationService
 
 
+@lru_cache(maxsize=1)
+def _utc_iso_z_for_second(second: int) -> str:
+    return datetime.utcfromtimestamp(second).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _utc_iso_z() -> str:
+    """Current UTC time as ISO 8601 with a Z suffix, formatted at most once per second"""
+    return _utc_iso_z_for_second(int(time.time()))
+
+
 class ForecastRequest(BaseModel):
     """Request model for generating custom forecasts"""
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     days_back: int = Field(default=3, ge=1, le=7)
     include_images: bool = Field(default=False)
     epic_date_iso: Optional[str] = Field(default=None)
@@ -34,54 +50,255 @@ class ForecastRequest(BaseModel):
 
 class AlertSubscription(BaseModel):
     """Model for alert subscriptions"""
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     email: Optional[str] = Field(default=None)
     phone: Optional[str] = Field(default=None)
     alert_types: List[str] = Field(default=["CME", "FLARE"])
     min_confidence: float = Field(default=0.6, ge=0.0, le=1.0)
 
 
+class ForecastRecordOut(BaseModel):
+    """Forecast history entry as returned by the API, read from a ForecastRecord row"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    forecast: Optional[Dict[str, Any]] = Field(validation_alias="forecast_data")
+    created_at: datetime
+    accuracy_score: Optional[float] = None
+
+
+class AlertRecordOut(BaseModel):
+    """Active alert as returned by the API, read from an AlertRecord row"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    event_type: str
+    severity: str
+    message: str
+    created_at: datetime
+    expires_at: Optional[datetime] = None
+
+
+# Built once; converts a whole list of ORM rows in a single pydantic-core call
+_ALERT_LIST_ADAPTER = TypeAdapter(List[AlertRecordOut])
+
+
+def _rows_to_dicts(adapter: TypeAdapter, rows: List[Any]) -> List[Dict[str, Any]]:
+    """Convert ORM rows to plain dicts, leaving datetimes for orjson to render"""
+    return adapter.dump_python(adapter.validate_python(rows, from_attributes=True))
+
+
 class APIResponse(BaseModel):
-    """Standard API response wrapper"""
+    """Standard API response wrapper (documented schema; bodies are built by api_response)"""
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     success: bool
     data: Optional[Any] = None
     error: Optional[str] = None
-    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat() + "Z")
+    timestamp: str
+
+
+# Datetimes are handed to orjson as-is; naive values are UTC and all render with a Z suffix
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+class UTCORJSONResponse(ORJSONResponse):
+    """ORJSONResponse that serializes datetimes natively as RFC 3339 UTC"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | ORJSON_OPTIONS
+        )
+
+
+def api_response(
+    success: bool,
+    data: Any = None,
+    error: Optional[str] = None,
+    status_code: int = 200
+) -> ORJSONResponse:
+    """Build the APIResponse envelope directly, skipping Pydantic validation and re-encoding"""
+    return UTCORJSONResponse({
+        "success": success,
+        "data": data,
+        "error": error,
+        "timestamp": _utc_iso_z()
+    }, status_code=status_code)
+
+
+# Concurrency caps that keep the single event loop responsive under a flood of clients
+MAX_CONNECTIONS = int(os.getenv("API_MAX_CONNECTIONS", "1000"))
+MAX_WEBSOCKETS = int(os.getenv("API_MAX_WEBSOCKETS", "1000"))
+UNLIMITED_PATHS = {"/api/v1/health"}
+
+
+class ConnectionLimitMiddleware:
+    """Pure ASGI middleware that sheds load with a 503 once MAX_CONNECTIONS requests are in flight
+    
+    A slot is held until the final response body chunk is sent or the client
+    disconnects, so streamed responses count for their whole lifetime. The
+    counter is only touched on the event loop, so no lock is needed.
+    """
+    
+    def __init__(self, app, max_connections: int = MAX_CONNECTIONS):
+        self.app = app
+        self.max_connections = max_connections
+        self.active = 0
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in UNLIMITED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        
+        if self.active >= self.max_connections:
+            response = api_response(success=False, error="at_capacity", status_code=503)
+            await response(scope, receive, send)
+            return
+        
+        self.active += 1
+        released = False
+        
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                self.active -= 1
+        
+        async def receive_tracked():
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                release()
+            return message
+        
+        async def send_tracked(message):
+            try:
+                await send(message)
+            finally:
+                if message["type"] == "http.response.body" and not message.get("more_body", False):
+                    release()
+        
+        try:
+            await self.app(scope, receive_tracked, send_tracked)
+        finally:
+            # The app failed or returned without finishing the body
+            release()
+
+
+# Seconds a cached endpoint payload stays fresh; forecasts only change on the monitor cadence
+CURRENT_FORECAST_TTL = 60
+ACTIVE_ALERTS_TTL = 15
+
+
+class ResponseCache:
+    """In-process TTL cache for the data payload of read-heavy endpoints
+    
+    Cleared whenever a new forecast or alert is stored, so a hit is never
+    staler than the database it shadows
+    """
+    
+    def __init__(self):
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+    
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+    
+    def set(self, key: str, value: Any, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+    
+    def clear(self):
+        self._entries.clear()
+
+
+# Outbound messages buffered per WebSocket client before it is treated as too slow
+WS_QUEUE_SIZE = 256
 
 
 class WebSocketManager:
-    """Manages WebSocket connections for real-time updates"""
+    """Manages WebSocket connections for real-time updates
+    
+    Each client has a bounded outbound queue drained by its own sender task,
+    so one slow client never holds up a broadcast to the others
+    """
     
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Dict[WebSocket, asyncio.Queue] = {}
+        self._senders: Dict[WebSocket, asyncio.Task] = {}
+        self._closing: Set[asyncio.Task] = set()
     
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        queue = asyncio.Queue(maxsize=WS_QUEUE_SIZE)
+        self.active_connections[websocket] = queue
+        self._senders[websocket] = asyncio.create_task(self._sender_loop(websocket, queue))
     
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.active_connections.pop(websocket, None)
+        sender = self._senders.pop(websocket, None)
+        if sender is not None and sender is not asyncio.current_task():
+            sender.cancel()
+    
+    async def _sender_loop(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Send queued payloads to one client until it goes away"""
+        try:
+            while True:
+                payload = await queue.get()
+                await websocket.send_text(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Disconnected or closed mid-send
+            self.disconnect(websocket)
+    
+    def send(self, websocket: WebSocket, payload: str):
+        """Queue an already-encoded message for one client, dropping it if the client is backed up"""
+        queue = self.active_connections.get(websocket)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            pass
     
     async def broadcast(self, message: dict):
         """Broadcast message to all connected clients"""
         if not self.active_connections:
             return
-            
-        disconnected = []
-        for connection in self.active_connections:
+        
+        # Encode once and queue the same payload for every client
+        payload = orjson.dumps(message, option=ORJSON_OPTIONS).decode()
+        too_slow = []
+        for websocket, queue in self.active_connections.items():
             try:
-                await connection.send_json(message)
-            except WebSocketDisconnect:
-                disconnected.append(connection)
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                too_slow.append(websocket)
         
-        # Remove disconnected clients
-        for connection in disconnected:
-            self.active_connections.remove(connection)
+        # Drop clients that stopped reading; the close is not awaited here
+        for websocket in too_slow:
+            self.disconnect(websocket)
+            task = asyncio.create_task(websocket.close(code=1013))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+
+# Reply to client keepalive pings; constant, so encoded once
+WS_PONG = orjson.dumps({"type": "pong"}).decode()
 
 
 # Global instances
 db_manager = DatabaseManager()
 notification_service = NotificationService()
 websocket_manager = WebSocketManager()
+response_cache = ResponseCache()
 monitor_service = None
 
 
@@ -97,10 +314,12 @@ async def lifespan(app: FastAPI):
     await db_manager.initialize()
     
     # Start monitoring service
+    from backend.monitor import MonitorService
     monitor_service = MonitorService(
         db_manager=db_manager,
         notification_service=notification_service,
-        websocket_manager=websocket_manager
+        websocket_manager=websocket_manager,
+        response_cache=response_cache
     )
     await monitor_service.start()
     
@@ -118,9 +337,13 @@ app = FastAPI(
     title="NASA Space Weather Forecaster API",
     description="Real-time space weather forecasting using NASA data and AI analysis",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=UTCORJSONResponse
 )
 
+# Load shedding sits inside CORS so 503 replies still carry CORS headers
+app.add_middleware(ConnectionLimitMiddleware)
+
 # Enable CORS
 app.add_middleware(
     CORSMiddleware,
@@ -134,34 +357,40 @@ app.add_middleware(
 @app.get("/api/v1/health")
 async def health_check():
     """Health check endpoint"""
-    return APIResponse(success=True, data={"status": "healthy", "service": "space-weather-api"})
+    return api_response(success=True, data={"status": "healthy", "service": "space-weather-api"})
 
 
 @app.get("/api/v1/forecast/current", response_model=APIResponse)
 async def get_current_forecast():
     """Get the latest forecast from database or generate new one"""
     try:
+        cached = response_cache.get("forecast/current")
+        if cached is not None:
+            return api_response(success=True, data=cached)
+        
         # Try to get recent forecast from database
         recent_forecast = await db_manager.get_latest_forecast(max_age_hours=1)
         
         if recent_forecast:
-            return APIResponse(
-                success=True,
-                data={
-                    "forecast": recent_forecast.forecast_data,
-                    "generated_at": recent_forecast.created_at.isoformat() + "Z",
-                    "source": "cached"
-                }
-            )
+            data = {
+                "forecast": recent_forecast.forecast_data,
+                "generated_at": recent_forecast.created_at,
+                "source": "cached"
+            }
+            response_cache.set("forecast/current", data, CURRENT_FORECAST_TTL)
+            return api_response(success=True, data=data)
         
         # Generate new forecast if no recent one exists
-        result = run_forecast(days_back=3)
+        # Forecast generation makes blocking NASA and Claude calls; keep them off the event loop
+        from backend.forecaster import run_forecast
+        result = await asyncio.to_thread(run_forecast, days_back=3)
         
         if isinstance(result, ForecastBundle):
             # Store in database
             await db_manager.store_forecast(result)
+            response_cache.clear()
             
-            return APIResponse(
+            return api_response(
                 success=True,
                 data={
                     "forecast": result.model_dump(),
@@ -170,19 +399,20 @@ async def get_current_forecast():
                 }
             )
         else:
-            return APIResponse(
+            return api_response(
                 success=False,
                 error=f"Forecast generation failed: {result.error}"
             )
     
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return api_response(success=False, error=str(e))
 
 
 @app.post("/api/v1/forecast/generate", response_model=APIResponse)
 async def generate_custom_forecast(request: ForecastRequest, background_tasks: BackgroundTasks):
     """Generate a custom forecast with specified parameters"""
     try:
+        from backend.forecaster import SpaceWeatherForecaster, ForecastConfig
         config = ForecastConfig(
             days_back=request.days_back,
             include_images=request.include_images,
@@ -191,33 +421,37 @@ async def generate_custom_forecast(request: ForecastRequest, background_tasks: B
         )
         
         forecaster = SpaceWeatherForecaster(config)
-        result = forecaster.generate_forecast()
+        result = await asyncio.to_thread(forecaster.generate_forecast)
         
         if isinstance(result, ForecastBundle):
+            # Serialize once; the response body and the broadcast share the same dict
+            dumped = result.model_dump(mode="json")
+            
             # Store in database in background
             background_tasks.add_task(db_manager.store_forecast, result)
+            background_tasks.add_task(response_cache.clear)
             
             # Broadcast to websocket clients
             background_tasks.add_task(
                 websocket_manager.broadcast,
-                {"type": "new_forecast", "data": result.model_dump()}
+                {"type": "new_forecast", "data": dumped}
             )
             
-            return APIResponse(
+            return api_response(
                 success=True,
                 data={
-                    "forecast": result.model_dump(),
+                    "forecast": dumped,
                     "generated_at": result.generated_at
                 }
             )
         else:
-            return APIResponse(
+            return api_response(
                 success=False,
                 error=f"Forecast generation failed: {result.error}"
             )
     
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return api_response(success=False, error=str(e))
 
 
 @app.get("/api/v1/forecast/history", response_model=APIResponse)
@@ -226,72 +460,69 @@ async def get_forecast_history(
     limit: int = 50,
     event_type: Optional[str] = None
 ):
-    """Get historical forecasts"""
+    """Get historical forecasts, streamed row by row as they are read"""
     try:
-        forecasts = await db_manager.get_forecast_history(
+        rows = db_manager.iter_forecast_history(
             days_back=days,
             limit=limit,
             event_type=event_type
         )
-        
-        return APIResponse(
-            success=True,
-            data={
-                "forecasts": [
-                    {
-                        "id": f.id,
-                        "forecast": f.forecast_data,
-                        "created_at": f.created_at.isoformat() + "Z",
-                        "accuracy_score": f.accuracy_score
-                    }
-                    for f in forecasts
-                ],
-                "count": len(forecasts)
-            }
-        )
+        # Pull the first row up front so query failures still get the error envelope
+        first = await anext(rows, None)
     
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return api_response(success=False, error=str(e))
+    
+    return StreamingResponse(_stream_forecast_history(first, rows), media_type="application/json")
+
+
+def _dump_forecast_record(record: Any) -> bytes:
+    return orjson.dumps(ForecastRecordOut.model_validate(record).model_dump(), option=ORJSON_OPTIONS)
+
+
+async def _stream_forecast_history(first: Any, rows: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    """Emit the APIResponse envelope around forecasts serialized one row at a time"""
+    yield b'{"success":true,"data":{"forecasts":['
+    count = 0
+    if first is not None:
+        yield _dump_forecast_record(first)
+        count = 1
+        async for record in rows:
+            yield b"," + _dump_forecast_record(record)
+            count += 1
+    yield b'],"count":%d},"error":null,"timestamp":%s}' % (count, orjson.dumps(_utc_iso_z()))
 
 
 @app.get("/api/v1/alerts/active", response_model=APIResponse)
 async def get_active_alerts():
     """Get currently active space weather alerts"""
     try:
+        cached = response_cache.get("alerts/active")
+        if cached is not None:
+            return api_response(success=True, data=cached)
+        
         alerts = await db_manager.get_active_alerts()
+        data = {
+            "alerts": _rows_to_dicts(_ALERT_LIST_ADAPTER, alerts)
+        }
+        response_cache.set("alerts/active", data, ACTIVE_ALERTS_TTL)
         
-        return APIResponse(
-            success=True,
-            data={
-                "alerts": [
-                    {
-                        "id": alert.id,
-                        "event_type": alert.event_type,
-                        "severity": alert.severity,
-                        "message": alert.message,
-                        "created_at": alert.created_at.isoformat() + "Z",
-                        "expires_at": alert.expires_at.isoformat() + "Z" if alert.expires_at else None
-                    }
-                    for alert in alerts
-                ]
-            }
-        )
+        return api_response(success=True, data=data)
     
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return api_response(success=False, error=str(e))
 
 
 @app.post("/api/v1/alerts/subscribe", response_model=APIResponse)
 async def subscribe_to_alerts(subscription: AlertSubscription):
     """Subscribe to space weather alerts"""
     try:
-        # Validate email format if provided
+        # Validate email format if provided; syntax only, the DNS deliverability lookup would block the loop
         if subscription.email:
-            from email_validator import validate_email, EmailNotValidError
             try:
-                validate_email(subscription.email)
+                validate_email(subscription.email, check_deliverability=False)
             except EmailNotValidError:
-                return APIResponse(success=False, error="Invalid email format")
+                return api_response(success=False, error="Invalid email format")
         
         # Store subscription in database
         subscription_id = await db_manager.store_alert_subscription(
@@ -301,13 +532,13 @@ async def subscribe_to_alerts(subscription: AlertSubscription):
             min_confidence=subscription.min_confidence
         )
         
-        return APIResponse(
+        return api_response(
             success=True,
             data={"subscription_id": subscription_id, "message": "Successfully subscribed to alerts"}
         )
     
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return api_response(success=False, error=str(e))
 
 
 @app.get("/api/v1/stats/accuracy", response_model=APIResponse)
@@ -316,36 +547,41 @@ async def get_accuracy_stats():
     try:
         stats = await db_manager.get_accuracy_stats()
         
-        return APIResponse(
+        return api_response(
             success=True,
             data=stats
         )
     
     except Exception as e:
-        return APIResponse(success=False, error=str(e))
+        return api_response(success=False, error=str(e))
 
 
 @app.websocket("/ws/forecasts")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time forecast updates"""
+    if len(websocket_manager.active_connections) >= MAX_WEBSOCKETS:
+        # 1013: try again later
+        await websocket.close(code=1013)
+        return
+    
     await websocket_manager.connect(websocket)
     try:
-        # Send initial connection confirmation
-        await websocket.send_json({
+        # Send initial connection confirmation; all sends go through the client's queue
+        websocket_manager.send(websocket, orjson.dumps({
             "type": "connection",
             "message": "Connected to NASA Space Weather real-time updates",
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        })
+            "timestamp": _utc_iso_z()
+        }).decode())
         
-        # Keep connection alive and handle client messages
+        # Keep the connection open; the only client command is a keepalive ping
         while True:
             data = await websocket.receive_text()
-            # Echo client messages for now (could implement commands later)
-            await websocket.send_json({
-                "type": "echo",
-                "data": data,
-                "timestamp": datetime.utcnow().isoformat() + "Z"
-            })
+            try:
+                message = orjson.loads(data)
+            except orjson.JSONDecodeError:
+                continue
+            if isinstance(message, dict) and message.get("type") == "ping":
+                websocket_manager.send(websocket, WS_PONG)
     
     except WebSocketDisconnect:
         websocket_manager.disconnect(websocket)
@@ -353,10 +589,16 @@ async def websocket_endpoint(websocket: WebSocket):
 
 # Development server configuration
 if __name__ == "__main__":
+    # The monitor, response cache and WebSocket registry live in-process, so each
+    # worker runs its own copy; keep the default at one and scale via WEB_CONCURRENCY
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
     uvicorn.run(
         "api_server:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        workers=workers,
+        reload=workers == 1,
+        loop="uvloop",
+        http="httptools",
         log_level="info"
     )
\ No newline at end of file
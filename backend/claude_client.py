@@ -7,7 +7,8 @@ import os
 import json
 from anthropic import Anthropic
 from pydantic import BaseModel, TypeAdapter
-from typing import Type, Any, Dict, List, Union
+from typing import Type, Any, Dict, List, Tuple, Union
+from functools import lru_cache
 import logging
 
 # Setup logging
@@ -17,6 +18,24 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 
+@lru_cache(maxsize=32)
+def _schema_for(schema_model: Type[BaseModel]) -> Tuple[Dict[str, Any], str]:
+    """JSON schema for a Pydantic model and its prompt text, built once per model"""
+    schema = TypeAdapter(schema_model).json_schema()
+    # Compact separators: Claude reads it the same and the prompt is far fewer tokens
+    return schema, json.dumps(schema, separators=(",", ":"))
+
+@lru_cache(maxsize=32)
+def _schema_system_prompt(system_prompt: str, schema_model: Type[BaseModel]) -> str:
+    """System prompt with the JSON schema instruction appended, built once per prompt and model"""
+    _, schema_text = _schema_for(schema_model)
+    return f"""{system_prompt}
+
+CRITICAL: You must respond with valid JSON that exactly matches this schema:
+{schema_text}
+
+Do not include any text before or after the JSON. Only return the JSON object."""
+
 class ClaudeClient:
     """Client for Anthropic Claude with structured JSON schema support"""
     
@@ -132,15 +151,10 @@ class ClaudeClient:
             Validated forecast model or error dict
         """
         # Generate JSON schema from Pydantic model
-        schema = TypeAdapter(schema_model).json_schema()
+        schema, _ = _schema_for(schema_model)
         
         # Add JSON format instruction to system prompt
-        enhanced_system = f"""{system_prompt}
-
-CRITICAL: You must respond with valid JSON that exactly matches this schema:
-{json.dumps(schema, indent=2)}
-
-Do not include any text before or after the JSON. Only return the JSON object."""
+        enhanced_system = _schema_system_prompt(system_prompt, schema_model)
         
         # Get raw JSON from Claude
         raw_json = self.parse_with_schema(
@@ -5,7 +5,7 @@ SQLAlchemy models and data persistence layer
 
 import os
 import json
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 from datetime import datetime, timedelta, timezone
 import asyncio
 from contextlib import asynccontextmanager
@@ -15,7 +15,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.future import select
-from sqlalchemy import desc, func, and_
+from sqlalchemy import desc, func, and_, text
 import sqlite3
 
 try:
@@ -94,6 +94,14 @@ class SystemLog(Base):
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
 
 
+# Connection pool sizing for server databases (SQLite uses SQLAlchemy's defaults)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Connections opened at startup so the first requests skip the connect handshake
+DB_POOL_WARM = int(os.getenv("DB_POOL_WARM", "5"))
+
+
 class DatabaseManager:
     """Manages database connections and operations"""
     
@@ -119,13 +127,25 @@ class DatabaseManager:
                 echo=False  # Set to True for SQL debugging
             )
             
-            # Create async engine for operations
-            if "sqlite://" in self.database_url:
+            # Create async engine for operations; stale connections are caught by pre-ping
+            is_sqlite = "sqlite://" in self.database_url
+            if is_sqlite:
                 async_url = self.database_url.replace("sqlite://", "sqlite+aiosqlite://")
+                pool_options = {}
             else:
                 async_url = self.database_url.replace("postgresql://", "postgresql+asyncpg://")
+                pool_options = {
+                    "pool_size": DB_POOL_SIZE,
+                    "max_overflow": DB_MAX_OVERFLOW,
+                    "pool_timeout": DB_POOL_TIMEOUT,
+                }
             
-            self.async_engine = create_async_engine(async_url, echo=False)
+            self.async_engine = create_async_engine(
+                async_url,
+                echo=False,
+                pool_pre_ping=True,
+                **pool_options
+            )
             
             # Create tables
             Base.metadata.create_all(bind=self.engine)
@@ -134,12 +154,22 @@ class DatabaseManager:
             self.session_factory = sessionmaker(bind=self.engine)
             self.async_session_factory = async_sessionmaker(bind=self.async_engine, expire_on_commit=False)
             
+            await self._warm_pool(1 if is_sqlite else min(DB_POOL_WARM, DB_POOL_SIZE))
+            
             print(f"Database initialized: {self.database_url}")
             
         except Exception as e:
             print(f"Database initialization failed: {e}")
             raise
     
+    async def _warm_pool(self, connections: int):
+        """Open pool connections up front; they are held concurrently so each one is distinct"""
+        async def ping():
+            async with self.async_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        
+        await asyncio.gather(*(ping() for _ in range(connections)))
+    
     async def close(self):
         """Close database connections"""
         if self.async_engine:
@@ -201,18 +231,35 @@ class DatabaseManager:
     ) -> List[ForecastRecord]:
         """Get historical forecasts with optional filtering"""
         async with self.get_session() as session:
-            cutoff_time = datetime.utcnow() - timedelta(days=days_back)
-            
-            query = select(ForecastRecord).where(
-                ForecastRecord.created_at >= cutoff_time
-            ).order_by(desc(ForecastRecord.created_at)).limit(limit)
-            
-            if event_type:
-                query = query.where(ForecastRecord.event_types.contains(event_type))
-            
+            query = self._forecast_history_query(days_back, limit, event_type)
             result = await session.execute(query)
             return result.scalars().all()
     
+    async def iter_forecast_history(
+        self,
+        days_back: int = 7,
+        limit: int = 50,
+        event_type: Optional[str] = None
+    ) -> AsyncIterator[ForecastRecord]:
+        """Yield historical forecasts one at a time from a server-side cursor"""
+        async with self.get_session() as session:
+            query = self._forecast_history_query(days_back, limit, event_type)
+            result = await session.stream_scalars(query.execution_options(yield_per=10))
+            async for record in result:
+                yield record
+    
+    @staticmethod
+    def _forecast_history_query(days_back: int, limit: int, event_type: Optional[str]):
+        cutoff_time = datetime.utcnow() - timedelta(days=days_back)
+        
+        query = select(ForecastRecord).where(
+            ForecastRecord.created_at >= cutoff_time
+        ).order_by(desc(ForecastRecord.created_at)).limit(limit)
+        
+        if event_type:
+            query = query.where(ForecastRecord.event_types.contains(event_type))
+        return query
+    
     async def store_alert(
         self,
         event_type: str,
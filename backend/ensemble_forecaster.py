@@ -325,8 +325,8 @@ class EnsembleSpaceWeatherForecaster:
         return {
             'cme_arrival': arrival_pred,
             'geoeffectiveness': geo_analysis,
-            'solar_particle_event': sep_prediction,
-            'substorm_forecast': substorm_prediction,
+            'solar_particle_event': sep_prediction.to_dict(),
+            'substorm_forecast': substorm_prediction.to_dict(),
             'model_confidence': arrival_pred['confidence']
         }
     
@@ -220,11 +220,11 @@ class ExpertSpaceWeatherForecaster:
                     flare_class, source_longitude, flare_time
                 )
                 
-                if sep_prediction.get('sep_expected', False):
+                if sep_prediction.sep_expected:
                     advanced_analysis['solar_particle_events'].append({
                         'flare_id': flare_data.get('flrID', 'unknown'),
                         'flare_class': flare_class,
-                        'prediction': sep_prediction
+                        'prediction': sep_prediction.to_dict()
                     })
                     
             except Exception as e:
@@ -248,7 +248,7 @@ class ExpertSpaceWeatherForecaster:
             substorm_prediction = self.advanced_physics.predict_magnetospheric_substorm(
                 velocity, bz_gsm, density
             )
-            advanced_analysis['substorm_predictions'] = substorm_prediction
+            advanced_analysis['substorm_predictions'] = substorm_prediction.to_dict()
             
         except Exception as e:
             logger.warning(f"Substorm prediction failed: {e}")
@@ -273,7 +273,7 @@ class ExpertSpaceWeatherForecaster:
             drag_analysis = self.advanced_physics.calculate_satellite_drag(
                 sample_satellite, f107_index, ap_index
             )
-            advanced_analysis['satellite_drag_analysis'] = drag_analysis
+            advanced_analysis['satellite_drag_analysis'] = drag_analysis.to_dict()
             
         except Exception as e:
             logger.warning(f"Satellite drag analysis failed: {e}")
@@ -296,8 +296,7 @@ class ExpertSpaceWeatherForecaster:
                 scint_pred = self.advanced_physics.predict_ionospheric_scintillation(
                     location['lat'], location['lon'], location['local_time'], kp_index
                 )
-                scint_pred['location'] = location['name']
-                scintillation_forecasts.append(scint_pred)
+                scintillation_forecasts.append({**scint_pred.to_dict(), 'location': location['name']})
             
             advanced_analysis['ionospheric_scintillation'] = {
                 'global_forecast': scintillation_forecasts,
@@ -175,11 +175,13 @@ class MonitorService:
         db_manager: DatabaseManager,
         notification_service: NotificationService,
         websocket_manager=None,
+        response_cache=None,
         config: Optional[MonitorConfig] = None
     ):
         self.db_manager = db_manager
         self.notification_service = notification_service
         self.websocket_manager = websocket_manager
+        self.response_cache = response_cache
         self.config = config or MonitorConfig()
         self.analyzer = EventAnalyzer(self.config)
         
@@ -259,12 +261,14 @@ class MonitorService:
                 
                 config = ForecastConfig(days_back=3, max_tokens=1500)
                 forecaster = SpaceWeatherForecaster(config)
-                result = forecaster.generate_forecast()
+                # Blocking NASA and Claude calls; run them off the shared event loop
+                result = await asyncio.to_thread(forecaster.generate_forecast)
                 
                 if isinstance(result, ForecastBundle):
                     forecast_bundle = result
                     # Store in database
                     await self.db_manager.store_forecast(forecast_bundle)
+                    self._invalidate_cached_responses()
                 else:
                     await self.db_manager.log_system_event(
                         "ERROR", "monitor", f"Forecast generation failed: {result.error}"
@@ -283,6 +287,11 @@ class MonitorService:
                 "ERROR", "monitor", f"Forecast analysis error: {e}"
             )
     
+    def _invalidate_cached_responses(self):
+        """Drop API responses cached from data that just changed"""
+        if self.response_cache:
+            self.response_cache.clear()
+    
     async def _process_alert(self, alert_info: Dict[str, Any], forecast_bundle: ForecastBundle):
         """Process and distribute a new alert"""
         try:
@@ -308,6 +317,7 @@ class MonitorService:
                 severity=alert_info["severity"],
                 message=alert_info["message"]
             )
+            self._invalidate_cached_responses()
             
             # Send notifications
             await self.notification_service.send_alert_notifications(alert_info)
@@ -5,23 +5,56 @@ Minimal working version
 """
 
 import os
-import json
 import requests
 from datetime import datetime, timedelta
 from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
+
+# Allow-all CORS headers, pre-encoded as ASGI header pairs
+CORS_HEADERS = [
+    (b"access-control-allow-origin", b"*"),
+    (b"access-control-allow-methods", b"*"),
+    (b"access-control-allow-headers", b"*"),
+]
+
+
+class StaticCORSMiddleware:
+    """Pure ASGI middleware that stamps fixed allow-all CORS headers.
+
+    The CORS policy here is unconditional, so there is nothing for
+    CORSMiddleware to negotiate per request. Preflight requests are
+    answered directly.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS":
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": CORS_HEADERS + [(b"content-length", b"0")]
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + CORS_HEADERS
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
 
 # Initialize FastAPI
 app = FastAPI(title="NASA Space Weather API", version="1.0.0")
 
 # Add CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(StaticCORSMiddleware)
 
 # Get API key
 NASA_API_KEY = os.getenv("NASA_API_KEY", "DEMO_KEY")
@@ -139,6 +139,8 @@ def create_requirements_txt():
 # Core Framework
 fastapi==0.104.1
 uvicorn==0.24.0
+uvloop==0.19.0
+httptools==0.6.1
 websockets==12.0
 
 # Data Processing
@@ -146,6 +148,9 @@ pandas==2.1.3
 numpy==1.25.2
 scipy==1.11.4
 requests==2.31.0
+aiohttp==3.9.1
+orjson>=3.10
+brotli>=1.1
 
 # Machine Learning & AI
 scikit-learn==1.3.2